@@ -1,7 +1,6 @@
 from django.contrib.auth.models import AbstractUser, BaseUserManager
 from django.db import models
-import secrets
-import string
+from utils.ids import generate_unique_id
 
 class CustomUserManager(BaseUserManager):
     def create_user(self, email, name, password=None, **extra_fields):
@@ -19,10 +18,6 @@ class CustomUserManager(BaseUserManager):
         extra_fields.setdefault('is_verified', True)
         return self.create_user(email, name, password, **extra_fields)
 
-def generate_unique_id():
-    """Generate a unique 16-digit alphanumeric ID"""
-    return ''.join(secrets.choice(string.ascii_uppercase + string.digits) for _ in range(16))
-
 class CustomUser(AbstractUser):
     ROLE_CHOICES = [
         ('provider', 'Provider'),
@@ -1,14 +1,9 @@
 from django.db import models
 from django.contrib.auth import get_user_model
-import secrets
-import string
+from utils.ids import generate_unique_id
 
 User = get_user_model()
 
-def generate_unique_id():
-    """Generate a unique 16-digit alphanumeric ID"""
-    return ''.join(secrets.choice(string.ascii_uppercase + string.digits) for _ in range(16))
-
 class ChatRoom(models.Model):
     id = models.CharField(max_length=16, primary_key=True, default=generate_unique_id, editable=False)
     seeker = models.ForeignKey(User, on_delete=models.CASCADE, related_name='seeker_chats')
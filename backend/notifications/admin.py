@@ -1,5 +1,5 @@
 from django.contrib import admin
-from .models import DeviceToken, Notification
+from .models import DeviceToken, Notification, NotificationOutbox
 
 @admin.register(DeviceToken)
 class DeviceTokenAdmin(admin.ModelAdmin):
@@ -11,4 +11,9 @@ class DeviceTokenAdmin(admin.ModelAdmin):
 class NotificationAdmin(admin.ModelAdmin):
     list_display = ['title', 'recipient', 'notification_type', 'is_read', 'is_sent', 'created_at']
     list_filter = ['notification_type', 'is_read', 'is_sent', 'created_at']
-    search_fields = ['title', 'recipient__name', 'recipient__email']
\ No newline at end of file
+    search_fields = ['title', 'recipient__name', 'recipient__email']
+
+@admin.register(NotificationOutbox)
+class NotificationOutboxAdmin(admin.ModelAdmin):
+    list_display = ['event_type', 'attempts', 'available_at', 'created_at']
+    list_filter = ['event_type', 'created_at']
@@ -0,0 +1,26 @@
+import time
+from django.core.management.base import BaseCommand
+
+from notifications.outbox import DEFAULT_BATCH_SIZE, drain
+
+class Command(BaseCommand):
+    help = 'Deliver queued notification side effects, such as favorite push notifications'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=DEFAULT_BATCH_SIZE, help='Events leased per batch')
+        parser.add_argument('--watch', action='store_true', help='Keep polling for new events instead of exiting when idle')
+        parser.add_argument('--interval', type=float, default=1.0, help='Seconds to sleep between polls with --watch')
+
+    def handle(self, *args, **options):
+        total_delivered = total_failed = 0
+        while True:
+            delivered, failed = drain(options['batch_size'])
+            total_delivered += delivered
+            total_failed += failed
+            if delivered or failed:
+                self.stdout.write(f'Delivered {delivered}, failed {failed}')
+            elif options['watch']:
+                time.sleep(options['interval'])
+            else:
+                break
+        self.stdout.write(self.style.SUCCESS(f'{total_delivered} events delivered, {total_failed} failed'))
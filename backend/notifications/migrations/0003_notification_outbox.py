@@ -0,0 +1,30 @@
+# Generated by Django 5.2.6 on 2026-10-18 01:08
+
+import django.utils.timezone
+import utils.ids
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('notifications', '0002_alter_devicetoken_id_alter_notification_id'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='NotificationOutbox',
+            fields=[
+                ('id', models.CharField(default=utils.ids.generate_unique_id, editable=False, max_length=16, primary_key=True, serialize=False)),
+                ('event_type', models.CharField(choices=[('favorite', 'Property Favorited')], max_length=20)),
+                ('payload', models.JSONField(default=dict)),
+                ('attempts', models.PositiveSmallIntegerField(default=0)),
+                ('available_at', models.DateTimeField(blank=True, default=django.utils.timezone.now, null=True)),
+                ('last_error', models.TextField(blank=True)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+            ],
+            options={
+                'indexes': [models.Index(condition=models.Q(('available_at__isnull', False)), fields=['available_at'], name='outbox_pending_idx')],
+            },
+        ),
+    ]
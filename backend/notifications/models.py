@@ -1,14 +1,10 @@
 from django.db import models
+from django.utils import timezone
 from django.contrib.auth import get_user_model
-import secrets
-import string
+from utils.ids import generate_unique_id
 
 User = get_user_model()
 
-def generate_unique_id():
-    """Generate a unique 16-digit alphanumeric ID"""
-    return ''.join(secrets.choice(string.ascii_uppercase + string.digits) for _ in range(16))
-
 class DeviceToken(models.Model):
     id = models.CharField(max_length=16, primary_key=True, default=generate_unique_id, editable=False)
     user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='device_tokens')
@@ -44,4 +40,31 @@ class Notification(models.Model):
         ordering = ['-created_at']
 
     def __str__(self):
-        return f"{self.title} - {self.recipient.name}"
\ No newline at end of file
+        return f"{self.title} - {self.recipient.name}"
+
+class NotificationOutbox(models.Model):
+    """Notification side effect committed with the write that caused it, delivered by drain_notification_outbox"""
+    EVENT_TYPES = [
+        ('favorite', 'Property Favorited'),
+    ]
+
+    id = models.CharField(max_length=16, primary_key=True, default=generate_unique_id, editable=False)
+    event_type = models.CharField(max_length=20, choices=EVENT_TYPES)
+    payload = models.JSONField(default=dict)
+    attempts = models.PositiveSmallIntegerField(default=0)
+    # Next delivery attempt; NULL once the event gave up after too many failures
+    available_at = models.DateTimeField(default=timezone.now, null=True, blank=True)
+    last_error = models.TextField(blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        indexes = [
+            models.Index(
+                fields=['available_at'],
+                name='outbox_pending_idx',
+                condition=models.Q(available_at__isnull=False),
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.event_type} - {self.id}"
@@ -0,0 +1,113 @@
+import logging
+from datetime import timedelta
+from django.contrib.auth import get_user_model
+from django.db import transaction
+from django.db.models import F
+from django.utils import timezone
+from .models import Notification, NotificationOutbox
+from .services import fcm_service
+
+logger = logging.getLogger(__name__)
+
+User = get_user_model()
+
+MAX_ATTEMPTS = 5
+RETRY_DELAY = timedelta(seconds=30)
+# Claimed events stay invisible to other workers this long; must exceed the
+# time to deliver a batch (FCM_TIMEOUT per device send)
+LEASE = timedelta(minutes=5)
+DEFAULT_BATCH_SIZE = 20
+
+class DeliveryError(Exception):
+    """An outbox event could not be delivered and should be retried"""
+
+def enqueue_favorite_notification(favorite, property_obj):
+    """Queue the owner's "property favorited" push in the caller's transaction"""
+    return NotificationOutbox.objects.create(
+        event_type='favorite',
+        payload={
+            'favorite_id': favorite.id,
+            'owner_id': property_obj.owner_id,
+            'user_id': favorite.user_id,
+            'property_title': property_obj.title,
+        },
+    )
+
+def _deliver_favorite(event):
+    payload = event.payload
+    if payload.get('notification_id'):
+        notification = Notification.objects.filter(pk=payload['notification_id']).first()
+    else:
+        users = User.objects.in_bulk([payload['owner_id'], payload['user_id']])
+        owner, user = users.get(payload['owner_id']), users.get(payload['user_id'])
+        if owner is None or user is None:
+            return
+        notification = fcm_service.create_favorite_notification(
+            property_owner=owner,
+            user=user,
+            property_title=payload['property_title']
+        )
+        if notification is None:
+            # Push is not configured or the owner has no devices: nothing to retry
+            return
+        # Retries push this notification again instead of storing another one
+        payload['notification_id'] = notification.id
+        NotificationOutbox.objects.filter(pk=event.pk).update(payload=payload)
+
+    if notification is None or notification.is_sent:
+        return
+    if not fcm_service.push(notification):
+        raise DeliveryError(f"No device accepted notification {notification.id}")
+
+HANDLERS = {
+    'favorite': _deliver_favorite,
+}
+
+def claim(batch_size=DEFAULT_BATCH_SIZE):
+    """Lease a batch of due events to this worker and count the attempt.
+
+    Rows are picked with SELECT ... FOR UPDATE SKIP LOCKED and pushed LEASE
+    into the future before the short transaction commits, so concurrent
+    workers never claim the same event and no lock is held while sending.
+    """
+    now = timezone.now()
+    with transaction.atomic():
+        events = list(
+            NotificationOutbox.objects.select_for_update(skip_locked=True)
+            .filter(available_at__lte=now)
+            .order_by('available_at')[:batch_size]
+        )
+        if events:
+            NotificationOutbox.objects.filter(pk__in=[event.pk for event in events]).update(
+                available_at=now + LEASE,
+                attempts=F('attempts') + 1,
+            )
+    for event in events:
+        event.attempts += 1
+    return events
+
+def drain(batch_size=DEFAULT_BATCH_SIZE):
+    """Deliver one batch of due events; returns (delivered, failed).
+
+    Delivered events are deleted; failed ones are retried with a growing
+    delay and parked (available_at NULL) after MAX_ATTEMPTS. An event whose
+    worker dies mid-delivery is picked up again once its lease expires.
+    """
+    delivered = failed = 0
+    for event in claim(batch_size):
+        try:
+            HANDLERS[event.event_type](event)
+        except Exception as e:
+            logger.exception(f"Outbox event {event.id} failed")
+            NotificationOutbox.objects.filter(pk=event.pk).update(
+                last_error=str(e),
+                available_at=(
+                    timezone.now() + RETRY_DELAY * 2 ** (event.attempts - 1)
+                    if event.attempts < MAX_ATTEMPTS else None
+                ),
+            )
+            failed += 1
+        else:
+            NotificationOutbox.objects.filter(pk=event.pk).delete()
+            delivered += 1
+    return delivered, failed
@@ -3,26 +3,25 @@ import requests
 from django.conf import settings
 from .models import DeviceToken, Notification
 
+# Seconds to wait for FCM before treating a device send as failed
+FCM_TIMEOUT = 10
+
 class FCMService:
     def __init__(self):
         self.server_key = getattr(settings, 'FCM_SERVER_KEY', None)
         self.fcm_url = 'https://fcm.googleapis.com/fcm/send'
 
-    def send_notification(self, user, title, body, data=None, notification_type='custom'):
-        """Send push notification to user's devices"""
+    def create_notification(self, user, title, body, data=None, notification_type='custom'):
+        """Store a notification for the user's devices, or None when it cannot be pushed"""
         if not self.server_key:
             print("FCM_SERVER_KEY not configured")
-            return False
+            return None
 
-        # Get user's active device tokens
-        device_tokens = DeviceToken.objects.filter(user=user, is_active=True)
-        
-        if not device_tokens.exists():
+        if not DeviceToken.objects.filter(user=user, is_active=True).exists():
             print(f"No active device tokens for user {user.name}")
-            return False
+            return None
 
-        # Create notification record
-        notification = Notification.objects.create(
+        return Notification.objects.create(
             recipient=user,
             title=title,
             body=body,
@@ -30,18 +29,27 @@ class FCMService:
             data=data or {}
         )
 
+    def push(self, notification):
+        """Push a stored notification to the recipient's devices; True once any device accepted it"""
+        device_tokens = DeviceToken.objects.filter(user_id=notification.recipient_id, is_active=True)
+
         success_count = 0
         for device_token in device_tokens:
-            if self._send_to_device(device_token.token, title, body, data):
+            if self._send_to_device(device_token.token, notification.title, notification.body, notification.data):
                 success_count += 1
 
         if success_count > 0:
             notification.is_sent = True
-            notification.save()
+            notification.save(update_fields=['is_sent'])
             return True
         
         return False
 
+    def send_notification(self, user, title, body, data=None, notification_type='custom'):
+        """Send push notification to user's devices"""
+        notification = self.create_notification(user, title, body, data, notification_type)
+        return notification is not None and self.push(notification)
+
     def _send_to_device(self, token, title, body, data=None):
         """Send notification to specific device token"""
         headers = {
@@ -61,7 +69,7 @@ class FCMService:
         }
 
         try:
-            response = requests.post(self.fcm_url, headers=headers, json=payload)
+            response = requests.post(self.fcm_url, headers=headers, json=payload, timeout=FCM_TIMEOUT)
             return response.status_code == 200
         except Exception as e:
             print(f"FCM Error: {e}")
@@ -80,8 +88,8 @@ class FCMService:
         
         return self.send_notification(recipient, title, body, data, 'message')
 
-    def send_favorite_notification(self, property_owner, user, property_title):
-        """Send notification when property is favorited"""
+    def create_favorite_notification(self, property_owner, user, property_title):
+        """Store the notification sent when a property is favorited"""
         title = "Property Favorited!"
         body = f"{user.name} added your property '{property_title}' to favorites"
         
@@ -91,7 +99,12 @@ class FCMService:
             'user_name': user.name,
         }
         
-        return self.send_notification(property_owner, title, body, data, 'favorite')
+        return self.create_notification(property_owner, title, body, data, 'favorite')
+
+    def send_favorite_notification(self, property_owner, user, property_title):
+        """Send notification when property is favorited"""
+        notification = self.create_favorite_notification(property_owner, user, property_title)
+        return notification is not None and self.push(notification)
 
     def send_custom_notification(self, user, title, body, data=None):
         """Send custom notification"""
@@ -24,6 +24,7 @@ INSTALLED_APPS = [
     'django.contrib.sessions',
     'django.contrib.messages',
     'django.contrib.staticfiles',
+    'django.contrib.postgres',
     'rest_framework',
     'rest_framework_simplejwt',
     'rest_framework_simplejwt.token_blacklist',
@@ -83,6 +84,34 @@ DATABASES = {
 }
 
 
+# Cache
+# https://docs.djangoproject.com/en/5.2/topics/cache/
+
+REDIS_URL = 'redis://127.0.0.1:6379/1'
+
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+        'LOCATION': REDIS_URL,
+        'KEY_PREFIX': 'lizy',
+    }
+}
+
+# Seconds a cached property list/search response stays valid
+PROPERTY_RESPONSE_CACHE_TIMEOUT = 300
+
+# Property detail views are buffered per process and bulk inserted every
+# MAX_EVENTS views or FLUSH_INTERVAL seconds; a viewer is counted once per
+# DEDUPE_WINDOW seconds and at most MAX_PENDING views wait for a flush
+PROPERTY_VIEW_BUFFER = {
+    'MAX_EVENTS': 200,
+    'FLUSH_INTERVAL': 5,
+    'MAX_PENDING': 20000,
+    'DEDUPE_WINDOW': 30 * 60,
+    'BACKGROUND': True,
+}
+
+
 # Password validation
 # https://docs.djangoproject.com/en/5.2/ref/settings/#auth-password-validators
 
@@ -119,6 +148,22 @@ USE_TZ = True
 
 STATIC_URL = 'static/'
 
+MEDIA_URL = 'media/'
+MEDIA_ROOT = BASE_DIR / 'media'
+
+# Listing photos and their thumbnails are stored in GCS
+STORAGES = {
+    'default': {
+        'BACKEND': 'django.core.files.storage.FileSystemStorage',
+    },
+    'staticfiles': {
+        'BACKEND': 'django.contrib.staticfiles.storage.StaticFilesStorage',
+    },
+    'property_images': {
+        'BACKEND': 'properties.storage.GoogleCloudStorage',
+    },
+}
+
 # Default primary key field type
 # https://docs.djangoproject.com/en/5.2/ref/settings/#default-auto-field
 
@@ -134,6 +179,22 @@ REST_FRAMEWORK = {
     ),
 }
 
+# Property search backend: 'fulltext' uses the weighted Postgres search
+# document on Property, 'icontains' keeps the legacy substring matching
+PROPERTY_SEARCH_BACKEND = 'fulltext'
+
+# Weights of the ?sort=relevance search score: text rank, recency decay on
+# createdAt and engagement from the favorite/view counters, each in [0, 1)
+PROPERTY_RELEVANCE = {
+    'TEXT_WEIGHT': 0.6,
+    'RECENCY_WEIGHT': 0.25,
+    'POPULARITY_WEIGHT': 0.15,
+    'RECENCY_HALF_LIFE_DAYS': 30,
+    'FAVORITE_WEIGHT': 5,
+    'VIEW_WEIGHT': 1,
+    'POPULARITY_SATURATION': 50,
+}
+
 # JWT Settings
 from datetime import timedelta
 SIMPLE_JWT = {
@@ -160,6 +221,9 @@ GCS_PROJECT_ID = 'easy-home-772e0'
 FILE_UPLOAD_MAX_MEMORY_SIZE = 5242880  # 5MB
 DATA_UPLOAD_MAX_MEMORY_SIZE = 5242880  # 5MB
 
+# Worker processes rendering uploaded listing photos
+PROPERTY_IMAGE_WORKERS = 2
+
 # FCM Settings
 FCM_SERVER_KEY = 'your-fcm-server-key-here'  # Add your FCM server key
 
@@ -0,0 +1,31 @@
+"""
+Settings for running the test suite.
+
+manage.py test selects this module; other runners should set
+DJANGO_SETTINGS_MODULE=project.test_settings.
+"""
+
+from .settings import *  # noqa: F401,F403
+
+# Tests run against a per-process local-memory cache
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+    }
+}
+
+# Tests write every view inline, inside the test's transaction
+PROPERTY_VIEW_BUFFER = {**PROPERTY_VIEW_BUFFER, 'MAX_EVENTS': 1, 'BACKGROUND': False}
+
+# Listing photos are written to disk instead of GCS
+STORAGES = {
+    **STORAGES,
+    'property_images': {
+        'BACKEND': 'django.core.files.storage.FileSystemStorage',
+        'OPTIONS': {
+            'location': MEDIA_ROOT / 'test',
+            'base_url': MEDIA_URL + 'test/',
+            'allow_overwrite': True,
+        },
+    },
+}
@@ -1,4 +1,7 @@
 from django.contrib import admin
+from django.contrib.postgres.search import TrigramWordSimilarity
+from django.db.models import Q
+from django.db.models.functions import Greatest, Upper
 from .models import Property, Favorite, PropertyView
 
 @admin.register(Property)
@@ -8,6 +11,28 @@ class PropertyAdmin(admin.ModelAdmin):
     search_fields = ['title', 'location', 'city', 'owner__name', 'owner__email']
     readonly_fields = ['createdAt', 'updatedAt']
     
+    def get_search_results(self, request, queryset, search_term):
+        matches, may_have_duplicates = super().get_search_results(request, queryset, search_term)
+        if search_term:
+            # Near-miss spellings of city/locality, served by the trigram indexes
+            fuzzy = queryset.alias(
+                city_upper=Upper('city'),
+                location_upper=Upper('location'),
+            ).filter(
+                Q(city_upper__trigram_word_similar=search_term) |
+                Q(location_upper__trigram_word_similar=search_term)
+            )
+            queryset = (matches | fuzzy).annotate(
+                similarity=Greatest(
+                    TrigramWordSimilarity(search_term, 'title'),
+                    TrigramWordSimilarity(search_term, 'location'),
+                    TrigramWordSimilarity(search_term, 'city'),
+                )
+            ).order_by('-similarity', '-createdAt')
+        else:
+            queryset = matches
+        return queryset, may_have_duplicates
+    
     fieldsets = (
         ('Basic Information', {
             'fields': ('title', 'description', 'type', 'category', 'roomConfig', 'listingType')
@@ -2,10 +2,12 @@ from rest_framework.decorators import api_view, permission_classes
 from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated
 from rest_framework import status
-from django.db.models import Count, Q
-from django.utils import timezone
-from datetime import timedelta
+from django.db.models import Sum
 from .models import Property, Favorite, PropertyView
+from .rollups import activity_totals, unique_viewers
+
+WEEK_DAYS = 7
+MONTH_DAYS = 30
 
 @api_view(['GET'])
 @permission_classes([IsAuthenticated])
@@ -17,11 +19,6 @@ def provider_analytics(request):
             status=status.HTTP_403_FORBIDDEN
         )
     
-    # Date ranges
-    now = timezone.now()
-    week_ago = now - timedelta(days=7)
-    month_ago = now - timedelta(days=30)
-    
     # Get provider's properties
     properties = Property.objects.filter(owner=request.user)
 
@@ -46,28 +43,23 @@ def provider_analytics(request):
     total_properties = properties.count()
     active_properties = properties.filter(isActive=True).count()
 
-    # Views analytics
-    all_views = PropertyView.objects.filter(property__owner=request.user)
-    total_views = all_views.count()
-    views_this_week = all_views.filter(createdAt__gte=week_ago).count()
-    views_this_month = all_views.filter(createdAt__gte=month_ago).count()
-    unique_viewers = all_views.filter(user__isnull=False).values('user').distinct().count()
+    # Lifetime totals come from the denormalized counters
+    totals = properties.aggregate(total_views=Sum('viewCount'), total_favorites=Sum('favoriteCount'))
+    total_views = totals['total_views'] or 0
+    total_favorites = totals['total_favorites'] or 0
+    # A viewer of several listings counts once, so this is not a sum of the
+    # per-listing counters
+    viewers = unique_viewers(request.user)
 
-    # Favorites analytics
-    all_favorites = Favorite.objects.filter(property__owner=request.user)
-    total_favorites = all_favorites.count()
-    favorites_this_week = all_favorites.filter(createdAt__gte=week_ago).count()
-    favorites_this_month = all_favorites.filter(createdAt__gte=month_ago).count()
+    # Weekly and monthly activity comes from the daily stats rollup
+    activity = activity_totals((WEEK_DAYS, MONTH_DAYS), property__owner=request.user)
+    views_this_week = sum(stats['views'][WEEK_DAYS] for stats in activity.values())
+    views_this_month = sum(stats['views'][MONTH_DAYS] for stats in activity.values())
+    favorites_this_week = sum(stats['favorites'][WEEK_DAYS] for stats in activity.values())
+    favorites_this_month = sum(stats['favorites'][MONTH_DAYS] for stats in activity.values())
 
     # Top performing properties (by views + favorites)
-    top_properties = properties.annotate(
-        view_count=Count('views'),
-        favorite_count=Count('favorited_by'),
-        views_this_week=Count('views', filter=Q(views__createdAt__gte=week_ago)),
-        views_this_month=Count('views', filter=Q(views__createdAt__gte=month_ago)),
-        favorites_this_week=Count('favorited_by', filter=Q(favorited_by__createdAt__gte=week_ago)),
-        favorites_this_month=Count('favorited_by', filter=Q(favorited_by__createdAt__gte=month_ago)),
-    ).order_by('-view_count', '-favorite_count')[:5]
+    top_properties = properties.order_by('-viewCount', '-favoriteCount')[:5]
 
     # Recent activity (last 10 views and favorites)
     recent_views = PropertyView.objects.filter(
@@ -115,13 +107,13 @@ def provider_analytics(request):
             'category': prop.category,
             'availability': prop.availability,
             'createdAt': prop.createdAt,
-            'total_views': prop.view_count,
-            'total_favorites': prop.favorite_count,
-            'unique_viewers': prop.views.filter(user__isnull=False).values('user').distinct().count(),
-            'views_this_week': prop.views_this_week,
-            'views_this_month': prop.views_this_month,
-            'favorites_this_week': prop.favorites_this_week,
-            'favorites_this_month': prop.favorites_this_month,
+            'total_views': prop.viewCount,
+            'total_favorites': prop.favoriteCount,
+            'unique_viewers': prop.uniqueViewerCount,
+            'views_this_week': activity[prop.id]['views'][WEEK_DAYS],
+            'views_this_month': activity[prop.id]['views'][MONTH_DAYS],
+            'favorites_this_week': activity[prop.id]['favorites'][WEEK_DAYS],
+            'favorites_this_month': activity[prop.id]['favorites'][MONTH_DAYS],
         })
 
     analytics_data = {
@@ -129,7 +121,7 @@ def provider_analytics(request):
         'active_properties': active_properties,
         'total_views': total_views,
         'total_favorites': total_favorites,
-        'unique_viewers': unique_viewers,
+        'unique_viewers': viewers,
         'views_this_week': views_this_week,
         'views_this_month': views_this_month,
         'favorites_this_week': favorites_this_week,
@@ -151,23 +143,18 @@ def property_analytics_detail(request, property_id):
             status=status.HTTP_404_NOT_FOUND
         )
     
-    # Date ranges
-    now = timezone.now()
-    week_ago = now - timedelta(days=7)
-    month_ago = now - timedelta(days=30)
-    
-    # Views analytics
     views = PropertyView.objects.filter(property=property_obj)
-    total_views = views.count()
-    views_this_week = views.filter(createdAt__gte=week_ago).count()
-    views_this_month = views.filter(createdAt__gte=month_ago).count()
-    unique_viewers = views.filter(user__isnull=False).values('user').distinct().count()
-    
-    # Favorites analytics
     favorites = Favorite.objects.filter(property=property_obj)
-    total_favorites = favorites.count()
-    favorites_this_week = favorites.filter(createdAt__gte=week_ago).count()
-    favorites_this_month = favorites.filter(createdAt__gte=month_ago).count()
+    
+    # Lifetime totals from the counters, recent activity from the daily stats rollup
+    total_views = property_obj.viewCount
+    total_favorites = property_obj.favoriteCount
+    unique_viewers = property_obj.uniqueViewerCount
+    activity = activity_totals((WEEK_DAYS, MONTH_DAYS), property=property_obj)[property_obj.id]
+    views_this_week = activity['views'][WEEK_DAYS]
+    views_this_month = activity['views'][MONTH_DAYS]
+    favorites_this_week = activity['favorites'][WEEK_DAYS]
+    favorites_this_month = activity['favorites'][MONTH_DAYS]
     
     # Recent viewers
     recent_views = views.select_related('user').order_by('-createdAt')[:10]
@@ -0,0 +1,246 @@
+import bisect
+import heapq
+import re
+import threading
+import time
+from django.core.cache import cache
+from django.db.models import Count
+from .cache import degrade_to_miss
+from .models import Property
+
+LOCATION_KINDS = ('city', 'state', 'location')
+DEFAULT_LIMIT = 10
+MAX_LIMIT = 25
+
+# Prefixes matching more keys than this are too costly to rank per keystroke;
+# their top results are memoized and rebuilt from their children's
+HEAVY_RANGE = 256
+SYNC_INTERVAL = 1.0
+EVENT_GRACE = 10.0
+
+SEQUENCE_KEY = 'properties:autocomplete:seq'
+EVENT_KEY = 'properties:autocomplete:event:{}'
+EVENT_TIMEOUT = 60 * 60 * 24
+
+_word_start = re.compile(r'(?:^|[^0-9a-z])(?=[0-9a-z])')
+
+def normalize(text):
+    return ' '.join(str(text).lower().split())
+
+def _suffixes(value):
+    """Every word-start suffix, so 'Koramangala, Bangalore' also matches 'bang'"""
+    text = normalize(value)
+    return {text[match.end():] for match in _word_start.finditer(text)} | {text}
+
+class LocationIndex:
+    """Sorted-array prefix index over the distinct city, state and location values.
+
+    keys holds (suffix, kind, value) tuples in sorted order, so a prefix maps to
+    one contiguous range found with bisect. counts holds the number of active
+    listings per (kind, value) and ranks the matches. memo holds the top
+    matches of every prefix whose range exceeds HEAVY_RANGE keys.
+    """
+
+    def __init__(self):
+        self.keys = []
+        self.counts = {}
+        self.memo = {}
+        self.sequence = None
+        self.synced_at = 0.0
+        self.gap_since = None
+        self.lock = threading.Lock()
+        self.sync_lock = threading.Lock()
+
+    def build(self):
+        counts = {}
+        for kind in LOCATION_KINDS:
+            rows = (
+                Property.objects.filter(isActive=True).exclude(**{kind: ''})
+                .order_by().values_list(kind).annotate(total=Count('id'))
+            )
+            counts.update({(kind, value): total for value, total in rows})
+        keys = sorted(
+            (suffix, kind, value)
+            for (kind, value) in counts
+            for suffix in _suffixes(value)
+        )
+        with self.lock:
+            self.counts, self.keys, self.memo = counts, keys, {}
+            self._rank_prefix('', 0, len(keys))
+
+    def set_count(self, kind, value, total):
+        """Apply the current listing count of one value, adding or dropping its keys"""
+        known = (kind, value) in self.counts
+        if total and not known:
+            for suffix in _suffixes(value):
+                bisect.insort(self.keys, (suffix, kind, value))
+        elif not total and known:
+            for suffix in _suffixes(value):
+                position = bisect.bisect_left(self.keys, (suffix, kind, value))
+                if position < len(self.keys) and self.keys[position] == (suffix, kind, value):
+                    del self.keys[position]
+        if total:
+            self.counts[(kind, value)] = total
+        else:
+            self.counts.pop((kind, value), None)
+        pair = (kind, value)
+        for prefix in {suffix[:length] for suffix in _suffixes(value) for length in range(len(suffix) + 1)}:
+            self._refresh_memo(prefix, pair)
+
+    def _rank(self, pair):
+        return (self.counts[pair], pair)
+
+    def _refresh_memo(self, prefix, pair):
+        """Fix up a memoized top list after one value's count changed.
+        
+        The list is re-ranked in place whenever the result is provably exact;
+        otherwise it is dropped and re-ranked from its children on next use.
+        """
+        top = self.memo.get(prefix)
+        if top is None:
+            return
+        listed = pair in self.counts
+        full = len(top) >= MAX_LIMIT
+        others = [entry for entry in top if entry != pair]
+        if pair in top:
+            if not full:
+                top = others + [pair] if listed else others
+            elif listed and top[-1] != pair and self._rank(pair) >= self._rank(top[-1]):
+                top = others + [pair]
+            else:
+                del self.memo[prefix]
+                return
+        elif not listed:
+            return
+        elif not full:
+            top = top + [pair]
+        elif self._rank(pair) > self._rank(top[-1]):
+            top = top[:-1] + [pair]
+        else:
+            return
+        self.memo[prefix] = sorted(top, key=self._rank, reverse=True)
+
+    def recount(self, values):
+        """Refresh the counts of the given (kind, value) pairs from the database"""
+        totals = {pair: 0 for pair in values}
+        for kind in LOCATION_KINDS:
+            wanted = {value for value_kind, value in values if value_kind == kind}
+            if not wanted:
+                continue
+            rows = (
+                Property.objects.filter(isActive=True, **{f'{kind}__in': wanted})
+                .order_by().values_list(kind).annotate(total=Count('id'))
+            )
+            totals.update({(kind, value): total for value, total in rows})
+        with self.lock:
+            for (kind, value), total in totals.items():
+                self.set_count(kind, value, total)
+
+    @degrade_to_miss()
+    def sync(self):
+        """Catch up with property writes published by any process"""
+        now = time.monotonic()
+        if self.sequence is not None and now - self.synced_at < SYNC_INTERVAL:
+            return
+        if not self.sync_lock.acquire(blocking=self.sequence is None):
+            return
+        try:
+            self.synced_at = now
+            latest = cache.get(SEQUENCE_KEY) or 0
+            if self.sequence is None or latest < self.sequence:
+                self.build()
+                self.sequence = latest
+                return
+            if latest == self.sequence:
+                return
+            
+            sequences = range(self.sequence + 1, latest + 1)
+            events = cache.get_many([EVENT_KEY.format(seq) for seq in sequences])
+            applied = []
+            for seq in sequences:
+                event = events.get(EVENT_KEY.format(seq))
+                if event is None:
+                    break
+                applied.append(event)
+            
+            if len(applied) < len(sequences):
+                # A writer may be between bumping the sequence and storing its
+                # event; only an event missing for long was lost or evicted
+                self.gap_since = self.gap_since or now
+                if now - self.gap_since > EVENT_GRACE:
+                    self.build()
+                    self.sequence, self.gap_since = latest, None
+                    return
+            else:
+                self.gap_since = None
+            
+            if applied:
+                self.recount({tuple(pair) for event in applied for pair in event})
+                self.sequence += len(applied)
+        finally:
+            self.sync_lock.release()
+
+    def _top(self, pairs):
+        return heapq.nlargest(MAX_LIMIT, set(pairs), key=self._rank)
+
+    def _range(self, prefix, start=0, end=None):
+        end = len(self.keys) if end is None else end
+        return (
+            bisect.bisect_left(self.keys, (prefix,), start, end),
+            bisect.bisect_left(self.keys, (prefix + '\uffff',), start, end),
+        )
+
+    def _rank_prefix(self, prefix, start, end):
+        """Top matches of a prefix, merging memoized child prefixes bottom-up"""
+        if end - start <= HEAVY_RANGE:
+            return self._top((kind, value) for _, kind, value in self.keys[start:end])
+        if prefix in self.memo:
+            return self.memo[prefix]
+
+        candidates = []
+        position, depth = start, len(prefix)
+        while position < end:
+            suffix, kind, value = self.keys[position]
+            if len(suffix) == depth:
+                candidates.append((kind, value))
+                position += 1
+                continue
+            _, child_end = self._range(suffix[:depth + 1], position, end)
+            candidates.extend(self._rank_prefix(suffix[:depth + 1], position, child_end))
+            position = child_end
+
+        self.memo[prefix] = top = self._top(candidates)
+        return top
+
+    def search(self, prefix, limit=DEFAULT_LIMIT):
+        prefix = normalize(prefix)
+        if not prefix:
+            return []
+        with self.lock:
+            start, end = self._range(prefix)
+            top = self._rank_prefix(prefix, start, end)
+            return [
+                {'value': value, 'kind': kind, 'count': self.counts[(kind, value)]}
+                for kind, value in top[:limit]
+            ]
+
+location_index = LocationIndex()
+
+def location_values(*rows):
+    """(kind, value) pairs of property rows or instances"""
+    pairs = set()
+    for row in rows:
+        for kind in LOCATION_KINDS:
+            value = row.get(kind) if isinstance(row, dict) else getattr(row, kind)
+            if value:
+                pairs.add((kind, value))
+    return pairs
+
+@degrade_to_miss()
+def publish_location_changes(values):
+    """Tell every process's index to recount these (kind, value) pairs"""
+    if not values:
+        return
+    cache.add(SEQUENCE_KEY, 0, timeout=None)
+    sequence = cache.incr(SEQUENCE_KEY)
+    cache.set(EVENT_KEY.format(sequence), sorted(values), EVENT_TIMEOUT)
@@ -0,0 +1,44 @@
+from django.db import connection, transaction
+from django.utils import timezone
+from .autocomplete import LOCATION_KINDS, location_values, publish_location_changes
+from .cache import bump_listing_version, invalidate_details
+from .models import Property
+
+STATUS_FIELDS = ('availability', 'isActive')
+
+def bulk_update_status(owner, ids, **changes):
+    """Set availability / isActive on many of an owner's properties in one UPDATE.
+    
+    Rows already in the requested state are left untouched. Returns the ids
+    that actually changed, read back with RETURNING.
+    """
+    changes = {field: value for field, value in changes.items() if field in STATUS_FIELDS and value is not None}
+    if not ids or not changes:
+        return []
+    
+    quote = connection.ops.quote_name
+    meta = Property._meta
+    columns = {field: quote(meta.get_field(field).column) for field in changes}
+    assignments = ', '.join(f'{columns[field]} = %s' for field in changes)
+    differs = ' OR '.join(f'{columns[field]} IS DISTINCT FROM %s' for field in changes)
+    returning = ', '.join(quote(column) for column in ('id',) + LOCATION_KINDS)
+    sql = (
+        f'UPDATE {quote(meta.db_table)} SET {assignments}, {quote("updatedAt")} = %s '
+        f'WHERE {quote("owner_id")} = %s AND {quote("id")} = ANY(%s) AND ({differs}) '
+        f'RETURNING {returning}'
+    )
+    params = [*changes.values(), timezone.now(), owner.pk, list(ids), *changes.values()]
+    
+    with transaction.atomic():
+        with connection.cursor() as cursor:
+            cursor.execute(sql, params)
+            rows = cursor.fetchall()
+        changed = [row[0] for row in rows]
+        if changed:
+            # The UPDATE bypasses post_save, so invalidate the caches here in one pass
+            transaction.on_commit(bump_listing_version)
+            transaction.on_commit(lambda: invalidate_details(changed))
+        if changed and 'isActive' in changes:
+            values = location_values(*(dict(zip(LOCATION_KINDS, row[1:])) for row in rows))
+            transaction.on_commit(lambda: publish_location_changes(values))
+    return changed
@@ -0,0 +1,185 @@
+import functools
+import hashlib
+import logging
+import time
+from urllib.parse import urlencode
+from django.conf import settings
+from django.core.cache import cache
+from rest_framework.response import Response
+from .conditional import collection_etag, not_modified, set_validators
+
+logger = logging.getLogger(__name__)
+
+LISTING_VERSION_KEY = 'properties:listing-version'
+CACHE_HITS_KEY = 'properties:cache-stats:hits'
+CACHE_MISSES_KEY = 'properties:cache-stats:misses'
+DETAIL_CACHE_TIMEOUT = 60 * 60
+
+def degrade_to_miss(fallback=None):
+    """Log cache backend errors and return fallback() instead of failing the request.
+    
+    The cache only saves work, so an unreachable Redis turns reads into
+    misses and writes or invalidations into no-ops. Entries that missed an
+    invalidation still expire with their timeout.
+    """
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            try:
+                return func(*args, **kwargs)
+            except Exception as e:
+                logger.warning(f"Cache unavailable in {func.__name__}: {str(e)}")
+                return fallback() if fallback else None
+        return wrapper
+    return decorator
+
+@degrade_to_miss()
+def get_listing_version():
+    """Current version of the property catalogue, bumped on every property write"""
+    version = cache.get(LISTING_VERSION_KEY)
+    if version is None:
+        # Seed from the clock so an evicted counter never reuses an old version
+        cache.add(LISTING_VERSION_KEY, int(time.time() * 1000), timeout=None)
+        version = cache.get(LISTING_VERSION_KEY)
+    return version
+
+@degrade_to_miss()
+def bump_listing_version():
+    """Invalidate every cache entry keyed on the listing version"""
+    try:
+        return cache.incr(LISTING_VERSION_KEY)
+    except ValueError:
+        return get_listing_version()
+
+def get_scope(user):
+    """Visibility scope of a user: providers only ever see their own listings"""
+    if user.role == 'provider':
+        return f'provider:{user.id}'
+    return user.role
+
+def request_cache_key(prefix, request):
+    """Versioned cache key for a request's normalized query parameters and role scope.
+    
+    None when the listing version cannot be read, so nothing is cached
+    under a key that later writes could not invalidate.
+    """
+    version = get_listing_version()
+    if version is None:
+        return None
+    params = urlencode(sorted(
+        (key, value)
+        for key, values in request.GET.lists()
+        for value in values
+        if value != ''
+    ))
+    digest = hashlib.md5(f'{get_scope(request.user)}?{params}'.encode()).hexdigest()
+    return f'properties:{prefix}:{version}:{digest}'
+
+def detail_cache_key(pk):
+    """Cache key of one property's detail representation"""
+    return f'properties:detail:{pk}'
+
+@degrade_to_miss()
+def get_cached(key):
+    """Cached value of key, or None on a miss or when there is no key"""
+    return cache.get(key) if key is not None else None
+
+@degrade_to_miss()
+def set_cached(key, value, timeout):
+    if key is not None:
+        cache.set(key, value, timeout)
+
+@degrade_to_miss(dict)
+def get_cached_details(pks):
+    """Cached detail representations for the given ids, keyed by id"""
+    cached = cache.get_many([detail_cache_key(pk) for pk in pks])
+    return {pk: cached[detail_cache_key(pk)] for pk in pks if detail_cache_key(pk) in cached}
+
+@degrade_to_miss()
+def cache_details(details):
+    """Store detail representations of active properties, keyed by id"""
+    cache.set_many(
+        {detail_cache_key(pk): _plain(data) for pk, data in details.items()},
+        DETAIL_CACHE_TIMEOUT
+    )
+
+@degrade_to_miss()
+def invalidate_details(pks):
+    """Drop cached detail representations after a property write"""
+    cache.delete_many([detail_cache_key(pk) for pk in pks])
+
+@degrade_to_miss()
+def record_cache_access(hit):
+    """Count a response cache hit or miss"""
+    key = CACHE_HITS_KEY if hit else CACHE_MISSES_KEY
+    cache.add(key, 0, timeout=None)
+    try:
+        cache.incr(key)
+    except ValueError:
+        pass
+
+def cache_stats():
+    """Hit/miss counters of the property response cache and memory used by the backend"""
+    hits = get_cached(CACHE_HITS_KEY) or 0
+    misses = get_cached(CACHE_MISSES_KEY) or 0
+    total = hits + misses
+    stats = {
+        'backend': settings.CACHES['default']['BACKEND'],
+        'hits': hits,
+        'misses': misses,
+        'hit_rate': round(hits / total, 4) if total else None,
+        'miss_rate': round(misses / total, 4) if total else None,
+        'listing_version': get_listing_version(),
+        'memory': None,
+    }
+    
+    try:
+        if hasattr(cache, '_cache') and hasattr(cache._cache, 'get_client'):
+            info = cache._cache.get_client().info('memory')
+            stats['memory'] = {
+                'used_memory': info.get('used_memory'),
+                'used_memory_human': info.get('used_memory_human'),
+                'maxmemory': info.get('maxmemory'),
+            }
+        elif hasattr(cache, '_cache'):
+            stats['memory'] = {'entries': len(cache._cache)}
+    except Exception as e:
+        logger.warning(f"Could not read cache memory stats: {str(e)}")
+    return stats
+
+def _plain(data):
+    """Strip serializer references (ReturnDict/ReturnList) so response data pickles cheaply"""
+    if isinstance(data, dict):
+        return {key: _plain(value) for key, value in data.items()}
+    if isinstance(data, list):
+        return [_plain(value) for value in data]
+    return data
+
+class CachedListMixin:
+    """Serve list responses from the cache.
+    
+    Entries are keyed by the normalized query parameters, the user's role scope
+    and the listing version, so any property write makes them unreachable.
+    """
+    cache_prefix = None
+    
+    def list(self, request, *args, **kwargs):
+        cache_key = request_cache_key(self.cache_prefix, request)
+        if cache_key is None:
+            return super().list(request, *args, **kwargs)
+        etag = collection_etag(cache_key)
+        response = not_modified(request, etag)
+        if response is not None:
+            return response
+        
+        data = get_cached(cache_key)
+        if data is not None:
+            record_cache_access(hit=True)
+            return set_validators(Response(data), etag)
+        
+        record_cache_access(hit=False)
+        response = super().list(request, *args, **kwargs)
+        if response.status_code == 200:
+            set_cached(cache_key, _plain(response.data), settings.PROPERTY_RESPONSE_CACHE_TIMEOUT)
+            set_validators(response, etag)
+        return response
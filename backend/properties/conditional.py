@@ -0,0 +1,61 @@
+import hashlib
+from functools import wraps
+from django.utils.cache import get_conditional_response, patch_cache_control
+from django.views.decorators.http import condition
+from .counters import COUNTER_FIELDS
+from .models import Property
+from .tracking import record_view
+
+def property_state(request, pk):
+    """updatedAt, owner and counters of an active property, read once per request from the primary key index"""
+    if not hasattr(request, '_property_state'):
+        request._property_state = Property.objects.filter(
+            pk=pk, isActive=True
+        ).values('updatedAt', 'owner_id', *COUNTER_FIELDS).first()
+    return request._property_state
+
+def current_counters(request, pk):
+    """Live counter values of the property, from the row read for the validators"""
+    state = property_state(request, pk)
+    return {field: state[field] for field in COUNTER_FIELDS} if state else {}
+
+def property_etag(request, pk):
+    """ETag for one property representation, derived from updatedAt, the counters and the query variant.
+
+    Counters change through UPDATEs that leave updatedAt alone, so they are
+    part of the tag for a 304 never to hide a new view or favorite count.
+    """
+    state = property_state(request, pk)
+    if state is None:
+        return None
+    counters = ':'.join(str(state[field]) for field in COUNTER_FIELDS)
+    variant = f'{pk}:{state["updatedAt"].isoformat()}:{counters}:{request.GET.urlencode()}'
+    return hashlib.md5(variant.encode()).hexdigest()
+
+def record_property_view(view_func):
+    """Count a view of the property before property_condition can answer it with 304"""
+    @wraps(view_func)
+    def wrapper(request, *args, pk, **kwargs):
+        state = property_state(request, pk)
+        if state is not None:
+            record_view(request, pk, owner_id=state['owner_id'])
+        return view_func(request, *args, pk=pk, **kwargs)
+    return wrapper
+
+# Answers If-None-Match with 304 before the row is loaded or serialized. There is
+# no Last-Modified: counter changes have no timestamp to compare it against
+property_condition = condition(etag_func=property_etag)
+
+def collection_etag(cache_key):
+    """ETag for a list response; the cache key already carries the listing version and scope"""
+    return f'"{hashlib.md5(cache_key.encode()).hexdigest()}"'
+
+def not_modified(request, etag):
+    """304 response when the client's copy of a collection is current, otherwise None"""
+    return get_conditional_response(request, etag=etag)
+
+def set_validators(response, etag):
+    """Attach the collection ETag and ask clients to revalidate before reusing their copy"""
+    response['ETag'] = etag
+    patch_cache_control(response, private=True, no_cache=True)
+    return response
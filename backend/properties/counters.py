@@ -0,0 +1,68 @@
+from django.db.models import Case, Count, F, IntegerField, OuterRef, Q, Subquery, Value, When
+from django.db.models.functions import Coalesce, Greatest
+from .models import COUNTER_FIELDS, Favorite, Property, PropertyView
+
+def adjust_counters(property_id, **deltas):
+    """Atomically add deltas (e.g. viewCount=1) to a property's counters, never below zero"""
+    updates = {
+        field: Greatest(F(field) + delta, 0)
+        for field, delta in deltas.items()
+        if delta
+    }
+    if updates:
+        Property.objects.filter(pk=property_id).update(**updates)
+
+def bulk_adjust_counters(deltas):
+    """Apply per-property deltas ({pk: {'viewCount': 3}}) in a single UPDATE, never below zero"""
+    fields = {field for changes in deltas.values() for field, delta in changes.items() if delta}
+    updates = {
+        field: Greatest(F(field) + Case(
+            *[When(pk=pk, then=Value(changes[field])) for pk, changes in deltas.items() if changes.get(field)],
+            default=Value(0),
+            output_field=IntegerField(),
+        ), 0)
+        for field in fields
+    }
+    if updates:
+        Property.objects.filter(pk__in=list(deltas)).update(**updates)
+
+def has_other_views(property_id, user_id, exclude_pk=None):
+    """Whether the user has another recorded view of the property"""
+    views = PropertyView.objects.filter(property_id=property_id, user_id=user_id)
+    if exclude_pk is not None:
+        views = views.exclude(pk=exclude_pk)
+    return views.exists()
+
+def _count(queryset, field='id', distinct=False):
+    return Coalesce(
+        Subquery(
+            queryset.filter(property=OuterRef('pk'))
+            .order_by()
+            .values('property')
+            .annotate(total=Count(field, distinct=distinct))
+            .values('total'),
+            output_field=IntegerField(),
+        ),
+        0,
+    )
+
+def actual_counts():
+    """Counter values recomputed from the Favorite and PropertyView tables"""
+    return {
+        'viewCount': _count(PropertyView.objects.all()),
+        'favoriteCount': _count(Favorite.objects.all()),
+        'uniqueViewerCount': _count(PropertyView.objects.filter(user__isnull=False), 'user', distinct=True),
+    }
+
+def drifted_properties(queryset=None):
+    """Properties whose stored counters differ from the recomputed values"""
+    queryset = Property.objects.all() if queryset is None else queryset
+    actual = {f'actual_{field}': expression for field, expression in actual_counts().items()}
+    drift = Q()
+    for field in COUNTER_FIELDS:
+        drift |= ~Q(**{field: F(f'actual_{field}')})
+    return queryset.annotate(**actual).filter(drift)
+
+def reconcile_counters(property_ids):
+    """Overwrite the counters of the given properties with recomputed values"""
+    return Property.objects.filter(pk__in=property_ids).update(**actual_counts())
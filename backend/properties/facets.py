@@ -0,0 +1,65 @@
+from django.db import connection
+from .models import Property
+
+FACET_CHOICES = {
+    'type': Property.PROPERTY_TYPES,
+    'category': Property.CATEGORIES,
+    'listingType': Property.LISTING_TYPES,
+    'availability': Property.AVAILABILITY_STATUS,
+    'furnishingStatus': Property.FURNISHING_STATUS,
+    'genderPreference': Property.GENDER_PREFERENCES,
+}
+
+TOP_CITIES = 10
+
+def compute_facets(queryset):
+    """Count listings per choice of every facet in one GROUPING SETS query.
+    
+    Returns {field: {value: count}} for each facet field plus 'city' and
+    'amenities'. Amenity counts unnest the JSON list in the same statement.
+    """
+    quote = connection.ops.quote_name
+    fields = list(FACET_CHOICES) + ['city']
+    inner_sql, params = queryset.order_by().values(*fields, 'amenities').query.sql_with_params()
+    columns = ', '.join(quote(field) for field in fields)
+    grouping_sets = ', '.join(f'({quote(field)})' for field in fields)
+    nulls = ', '.join('NULL' for _ in fields)
+    sql = (
+        f'WITH filtered AS ({inner_sql}) '
+        f'SELECT {columns}, NULL AS amenity, COUNT(*) FROM filtered '
+        f'GROUP BY GROUPING SETS ({grouping_sets}) '
+        f'UNION ALL '
+        f'SELECT {nulls}, amenity, COUNT(*) '
+        f'FROM filtered, jsonb_array_elements_text(filtered.{quote("amenities")}) AS amenity '
+        f'WHERE jsonb_typeof(filtered.{quote("amenities")}) = \'array\' '
+        f'GROUP BY amenity'
+    )
+    fields.append('amenities')
+    
+    counts = {field: {} for field in fields}
+    with connection.cursor() as cursor:
+        cursor.execute(sql, params)
+        for row in cursor.fetchall():
+            # Facet columns are non-nullable, so the one set column names the facet
+            for field, value in zip(fields, row[:-1]):
+                if value is not None:
+                    counts[field][value] = row[-1]
+                    break
+    return counts
+
+def facet_options(counts):
+    """Shape facet counts like the static property_filters options, with a count per choice"""
+    options = {
+        field: [
+            {'value': value, 'label': label, 'count': counts[field].get(value, 0)}
+            for value, label in choices
+        ]
+        for field, choices in FACET_CHOICES.items()
+    }
+    top_cities = sorted(counts['city'].items(), key=lambda item: (-item[1], item[0]))[:TOP_CITIES]
+    options['city'] = [{'value': city, 'label': city, 'count': count} for city, count in top_cities]
+    options['amenities'] = [
+        {'value': amenity, 'label': amenity, 'count': count}
+        for amenity, count in sorted(counts['amenities'].items(), key=lambda item: (-item[1], item[0]))
+    ]
+    return options
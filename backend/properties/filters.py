@@ -1,23 +1,129 @@
 import django_filters
+from django_filters.constants import EMPTY_VALUES
+from django.contrib.postgres.search import TrigramWordSimilarity
+from django.contrib.postgres.fields.ranges import NumericRange
+from django.db.models import Q
+from django.db.models.functions import Upper
+from rest_framework.exceptions import ValidationError
+from .geo import DEFAULT_RADIUS_KM, MAX_RADIUS_KM, within_bbox, within_radius
 from .models import Property
 
+class TrigramFilter(django_filters.CharFilter):
+    """Substring or near-miss match served by a pg_trgm index, ordered by similarity"""
+    
+    def filter(self, qs, value):
+        if value in EMPTY_VALUES:
+            return qs
+        
+        upper = f'{self.field_name}_upper'
+        similarity = f'{self.field_name}_similarity'
+        return qs.alias(**{upper: Upper(self.field_name)}).filter(
+            Q(**{f'{self.field_name}__icontains': value}) |
+            Q(**{f'{upper}__trigram_word_similar': value})
+        ).annotate(**{
+            similarity: TrigramWordSimilarity(value, self.field_name)
+        }).order_by(f'-{similarity}', '-createdAt', '-id')
+
+class NumberCSVFilter(django_filters.BaseCSVFilter, django_filters.NumberFilter):
+    pass
+
+class CharCSVFilter(django_filters.BaseCSVFilter, django_filters.CharFilter):
+    pass
+
+class PropertyOrderingFilter(django_filters.OrderingFilter):
+    """OrderingFilter with an id tie-breaker so cursor pagination stays stable"""
+    
+    def filter(self, qs, value):
+        if value in EMPTY_VALUES:
+            return qs
+        
+        ordering = [self.get_ordering_value(param) for param in value]
+        return qs.order_by(*ordering, '-id' if ordering[-1].startswith('-') else 'id')
+
 class PropertyFilter(django_filters.FilterSet):
     type = django_filters.ChoiceFilter(choices=Property.PROPERTY_TYPES)
     category = django_filters.ChoiceFilter(choices=Property.CATEGORIES)
     listingType = django_filters.ChoiceFilter(choices=Property.LISTING_TYPES)
     availability = django_filters.ChoiceFilter(choices=Property.AVAILABILITY_STATUS)
     roomConfig = django_filters.ChoiceFilter(choices=Property.ROOM_CONFIGS)
-    city = django_filters.CharFilter(lookup_expr='icontains')
-    location = django_filters.CharFilter(lookup_expr='icontains')
-    min_price = django_filters.NumberFilter(field_name='minimumPrice', lookup_expr='gte')
-    max_price = django_filters.NumberFilter(field_name='minimumPrice', lookup_expr='lte')
+    city = TrigramFilter()
+    location = TrigramFilter()
+    min_price = django_filters.NumberFilter(method='filter_price')
+    max_price = django_filters.NumberFilter(method='filter_price')
+    price_mode = django_filters.ChoiceFilter(
+        choices=[('minimum', 'Minimum price in range'), ('overlap', 'Price range overlaps')], method='filter_price'
+    )
     furnishingStatus = django_filters.ChoiceFilter(choices=Property.FURNISHING_STATUS)
     genderPreference = django_filters.ChoiceFilter(choices=Property.GENDER_PREFERENCES)
     
+    # Amenities: all-of by default, any-of with amenities_match=any
+    amenities = CharCSVFilter(method='filter_amenities', help_text='Comma separated, e.g. WiFi,Parking')
+    amenities_match = django_filters.ChoiceFilter(
+        choices=[('all', 'All of'), ('any', 'Any of')], method='filter_amenities_match'
+    )
+    
+    # Geospatial: lat/lng/radius (km) are applied together in filter_queryset
+    lat = django_filters.NumberFilter(method='filter_nearby', min_value=-90, max_value=90)
+    lng = django_filters.NumberFilter(method='filter_nearby', min_value=-180, max_value=180)
+    radius = django_filters.NumberFilter(method='filter_nearby', min_value=0, max_value=MAX_RADIUS_KM)
+    bbox = NumberCSVFilter(method='filter_bbox', help_text='south,west,north,east')
+    
+    ordering = PropertyOrderingFilter(fields=(('minimumPrice', 'price'), ('createdAt', 'createdAt')))
+    
     class Meta:
         model = Property
         fields = [
             'type', 'category', 'listingType', 'availability', 
             'roomConfig', 'city', 'location', 'furnishingStatus', 
             'genderPreference'
-        ]
\ No newline at end of file
+        ]
+    
+    def filter_price(self, queryset, name, value):
+        return queryset
+    
+    def filter_amenities(self, queryset, name, value):
+        amenities = [amenity.strip() for amenity in value if amenity.strip()]
+        if not amenities:
+            return queryset
+        
+        # Both forms are jsonb @> containment, served by the jsonb_path_ops index
+        if self.form.cleaned_data.get('amenities_match') == 'any':
+            match_any = Q()
+            for amenity in amenities:
+                match_any |= Q(amenities__contains=[amenity])
+            return queryset.filter(match_any)
+        return queryset.filter(amenities__contains=amenities)
+    
+    def filter_amenities_match(self, queryset, name, value):
+        return queryset
+    
+    def filter_nearby(self, queryset, name, value):
+        return queryset
+    
+    def filter_bbox(self, queryset, name, value):
+        if len(value) != 4:
+            raise ValidationError({'bbox': 'Expected south,west,north,east'})
+        return within_bbox(queryset, *value)
+    
+    def filter_queryset(self, queryset):
+        queryset = super().filter_queryset(queryset)
+        data = self.form.cleaned_data
+        
+        min_price, max_price = data.get('min_price'), data.get('max_price')
+        if data.get('price_mode') == 'overlap':
+            # Listings priced as [minimumPrice, maximumPrice] that intersect the requested range
+            if min_price is not None or max_price is not None:
+                queryset = queryset.filter(priceRange__overlap=NumericRange(min_price, max_price, '[]'))
+        else:
+            if min_price is not None:
+                queryset = queryset.filter(minimumPrice__gte=min_price)
+            if max_price is not None:
+                queryset = queryset.filter(minimumPrice__lte=max_price)
+        
+        lat, lng = data.get('lat'), data.get('lng')
+        if lat is not None and lng is not None:
+            radius = data.get('radius')
+            if radius is None:
+                radius = DEFAULT_RADIUS_KM
+            queryset = within_radius(queryset, lat, lng, radius, order_by_distance=not data.get('ordering'))
+        return queryset
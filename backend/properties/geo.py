@@ -0,0 +1,79 @@
+import math
+from django.db import models
+from django.db.models import BooleanField, FloatField, Func, Value
+from django.db.models.functions import ASin, Cast, Cos, Power, Radians, Sin, Sqrt
+
+EARTH_RADIUS_KM = 6371.0
+KM_PER_DEGREE_LAT = 111.045
+DEFAULT_RADIUS_KM = 5
+MAX_RADIUS_KM = 100
+
+class PointField(models.Field):
+    """Output type for Postgres point expressions (not a model column)"""
+    def db_type(self, connection):
+        return 'point'
+
+class BoxField(models.Field):
+    """Output type for Postgres box expressions (not a model column)"""
+    def db_type(self, connection):
+        return 'box'
+
+class GeoPoint(Func):
+    """Postgres point(x, y), with x = longitude and y = latitude"""
+    function = 'point'
+    output_field = PointField()
+
+class GeoBox(Func):
+    """Postgres box spanned by two corner points"""
+    function = 'box'
+    output_field = BoxField()
+
+class ContainedIn(Func):
+    """Geometric containment (<@), answered by the GiST location index"""
+    template = '(%(expressions)s)'
+    arg_joiner = ' <@ '
+    output_field = BooleanField()
+
+def location_point():
+    """Expression for a property's coordinates, identical to the indexed expression"""
+    return GeoPoint(Cast('longitude', FloatField()), Cast('latitude', FloatField()))
+
+def within_bbox(queryset, south, west, north, east):
+    """Filter properties inside a viewport bounding box"""
+    box = GeoBox(
+        GeoPoint(Value(float(west)), Value(float(south))),
+        GeoPoint(Value(float(east)), Value(float(north))),
+    )
+    return queryset.filter(ContainedIn(location_point(), box))
+
+def haversine_km(lat, lng):
+    """Great-circle distance in km from (lat, lng) to each property"""
+    dlat = Radians(Cast('latitude', FloatField())) - math.radians(lat)
+    dlng = Radians(Cast('longitude', FloatField())) - math.radians(lng)
+    a = (
+        Power(Sin(dlat / 2), 2)
+        + math.cos(math.radians(lat)) * Cos(Radians(Cast('latitude', FloatField()))) * Power(Sin(dlng / 2), 2)
+    )
+    return 2 * EARTH_RADIUS_KM * ASin(Sqrt(a))
+
+def within_radius(queryset, lat, lng, radius_km=DEFAULT_RADIUS_KM, order_by_distance=True):
+    """Filter properties within radius_km of (lat, lng), nearest first unless told otherwise.
+
+    The index narrows candidates to the enclosing bounding box, so the exact
+    distance is only computed for those rows.
+    """
+    lat, lng, radius_km = float(lat), float(lng), float(radius_km)
+    dlat = radius_km / KM_PER_DEGREE_LAT
+    dlng = radius_km / (KM_PER_DEGREE_LAT * max(math.cos(math.radians(lat)), 0.01))
+
+    queryset = within_bbox(
+        queryset,
+        max(lat - dlat, -90), max(lng - dlng, -180),
+        min(lat + dlat, 90), min(lng + dlng, 180),
+    )
+    queryset = queryset.annotate(
+        distance_km=haversine_km(lat, lng)
+    ).filter(distance_km__lte=radius_km)
+    if order_by_distance:
+        queryset = queryset.order_by('distance_km', 'id')
+    return queryset
@@ -0,0 +1,113 @@
+import hashlib
+import io
+import multiprocessing
+import re
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from django.conf import settings
+from django.core.files.base import ContentFile
+from django.core.files.storage import storages
+from PIL import Image, ImageOps, UnidentifiedImageError
+
+# Longest edge in pixels of each rendition; smaller images are never upscaled
+IMAGE_SIZES = {'small': 320, 'medium': 640, 'large': 1280}
+LIST_IMAGE_SIZES = ('small',)
+DETAIL_IMAGE_SIZES = tuple(IMAGE_SIZES)
+
+WEBP_QUALITY = 80
+MAX_UPLOAD_IMAGES = 5
+MAX_IMAGE_BYTES = 10 * 1024 * 1024
+MAX_IMAGE_PIXELS = 50_000_000
+
+STORAGE_ALIAS = 'property_images'
+
+# Ids of pipeline images are the sha256 of the uploaded bytes; other imageIds are left alone
+_image_id = re.compile(r'^[0-9a-f]{64}$')
+
+_executor = None
+_executor_lock = threading.Lock()
+
+def image_name(image_id, size):
+    return f'properties/{image_id}/{size}.webp'
+
+def render_thumbnails(data):
+    """Decode an image once and encode every size as WebP; runs in a worker process"""
+    largest = max(IMAGE_SIZES.values())
+    try:
+        image = Image.open(io.BytesIO(data))
+        if image.width * image.height > MAX_IMAGE_PIXELS:
+            raise ValueError("Image dimensions are too large")
+        # JPEGs are decoded straight at the smallest scale still above the largest size
+        image.draft('RGB', (largest, largest))
+        image = ImageOps.exif_transpose(image)
+        has_alpha = 'A' in image.getbands() or 'transparency' in image.info
+        image = image.convert('RGBA' if has_alpha else 'RGB')
+    except (UnidentifiedImageError, Image.DecompressionBombError, OSError):
+        raise ValueError("Upload is not a supported image")
+
+    renditions = {}
+    # Each size is scaled down from the next larger one instead of the original
+    for size, edge in sorted(IMAGE_SIZES.items(), key=lambda item: item[1], reverse=True):
+        image.thumbnail((edge, edge), Image.LANCZOS)
+        buffer = io.BytesIO()
+        image.save(buffer, 'WEBP', quality=WEBP_QUALITY)
+        renditions[size] = buffer.getvalue()
+    return renditions
+
+def _get_executor():
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            # spawn keeps the workers free of the server's threads and connections
+            _executor = ProcessPoolExecutor(
+                max_workers=settings.PROPERTY_IMAGE_WORKERS,
+                mp_context=multiprocessing.get_context('spawn'),
+            )
+        return _executor
+
+def _reset_executor():
+    global _executor
+    with _executor_lock:
+        _executor = None
+
+def store_images(uploads):
+    """Thumbnail and store uploaded image files, returning their image ids in upload order.
+
+    Images are identified by the sha256 of their bytes, so re-uploading a photo
+    reuses the stored renditions instead of processing it again.
+    """
+    storage = storages[STORAGE_ALIAS]
+    # The largest rendition is written last and marks an image as complete
+    marker = max(IMAGE_SIZES, key=IMAGE_SIZES.get)
+    image_ids, pending = [], {}
+    for upload in uploads:
+        data = upload.read()
+        image_id = hashlib.sha256(data).hexdigest()
+        image_ids.append(image_id)
+        if image_id not in pending and not storage.exists(image_name(image_id, marker)):
+            pending[image_id] = data
+
+    if pending:
+        executor = _get_executor()
+        futures = {image_id: executor.submit(render_thumbnails, data) for image_id, data in pending.items()}
+        try:
+            for image_id, future in futures.items():
+                renditions = future.result()
+                for size in sorted(renditions, key=IMAGE_SIZES.get):
+                    storage.save(image_name(image_id, size), ContentFile(renditions[size]))
+        except BrokenProcessPool:
+            _reset_executor()
+            raise
+    return image_ids
+
+def image_urls(image_ids, sizes=DETAIL_IMAGE_SIZES):
+    """URLs of the requested sizes for each pipeline image id"""
+    if not image_ids:
+        return []
+    storage = storages[STORAGE_ALIAS]
+    return [
+        {'id': image_id, **{size: storage.url(image_name(image_id, size)) for size in sizes}}
+        for image_id in image_ids
+        if isinstance(image_id, str) and _image_id.match(image_id)
+    ]
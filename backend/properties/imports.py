@@ -0,0 +1,106 @@
+import csv
+import io
+import json
+from itertools import islice
+from django.db import transaction
+from rest_framework.exceptions import ValidationError
+from .autocomplete import location_values, publish_location_changes
+from .cache import bump_listing_version
+from .models import Property
+from .serializers import PropertyCreateUpdateSerializer
+
+IMPORT_FORMATS = ('csv', 'jsonl')
+DEFAULT_BATCH_SIZE = 500
+
+# JSON list columns, given in CSV either as a JSON array or comma separated
+CSV_LIST_FIELDS = ('amenities', 'imageIds')
+
+def detect_format(filename, default='csv'):
+    """Import format implied by a file name"""
+    extension = filename.rsplit('.', 1)[-1].lower() if '.' in filename else ''
+    if extension in ('jsonl', 'ndjson'):
+        return 'jsonl'
+    if extension == 'csv':
+        return 'csv'
+    return default
+
+def _csv_value(field, value):
+    if field in CSV_LIST_FIELDS:
+        if value.lstrip().startswith('['):
+            try:
+                return json.loads(value)
+            except ValueError:
+                return value
+        return [item.strip() for item in value.split(',') if item.strip()]
+    return value
+
+def read_rows(stream, format):
+    """Yield (line number, row) from a text stream; unparseable rows are yielded as None"""
+    if format == 'csv':
+        reader = csv.DictReader(stream)
+        for row in reader:
+            # Blank cells fall back to the model defaults instead of failing validation
+            yield reader.line_num, {
+                field: _csv_value(field, value)
+                for field, value in row.items()
+                if field and value not in (None, '')
+            }
+    elif format == 'jsonl':
+        for line_number, line in enumerate(stream, start=1):
+            if not line.strip():
+                continue
+            try:
+                row = json.loads(line)
+            except ValueError:
+                row = None
+            yield line_number, row if isinstance(row, dict) else None
+    else:
+        raise ValueError(f"Unsupported import format: {format}")
+
+def open_text(binary_stream):
+    """Decode an uploaded or opened binary file lazily, tolerating a UTF-8 BOM"""
+    return io.TextIOWrapper(binary_stream, encoding='utf-8-sig', newline='')
+
+def import_properties(rows, owner, batch_size=DEFAULT_BATCH_SIZE, dry_run=False, on_error=None):
+    """Validate rows with the create serializer and bulk insert the valid ones chunk by chunk.
+
+    rows is an iterable of (line number, row) as produced by read_rows. Only one
+    chunk is held in memory at a time; each failing row is passed to
+    on_error(line, errors) as soon as it is seen. Returns created/failed totals.
+    """
+    # A single bound serializer validates every row, so its fields are built once
+    serializer = PropertyCreateUpdateSerializer()
+    rows = iter(rows)
+    created = failed = 0
+    locations = set()
+
+    while True:
+        chunk = list(islice(rows, batch_size))
+        if not chunk:
+            break
+
+        properties = []
+        for line, row in chunk:
+            if row is None:
+                errors = {'non_field_errors': ['Row is not a valid JSON object']}
+            else:
+                try:
+                    properties.append(Property(owner=owner, **serializer.run_validation(row)))
+                    continue
+                except ValidationError as e:
+                    errors = e.detail
+            failed += 1
+            if on_error:
+                on_error(line, errors)
+
+        if properties and not dry_run:
+            with transaction.atomic():
+                Property.objects.bulk_create(properties, batch_size=batch_size)
+            locations |= location_values(*properties)
+        created += len(properties)
+
+    if created and not dry_run:
+        # bulk_create skips post_save, so invalidate the listing caches here
+        transaction.on_commit(bump_listing_version)
+        transaction.on_commit(lambda: publish_location_changes(locations))
+    return {'created': created, 'failed': failed}
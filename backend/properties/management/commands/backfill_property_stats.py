@@ -0,0 +1,25 @@
+from datetime import date
+from django.core.management.base import BaseCommand, CommandError
+
+from properties.rollups import BACKFILL_DAYS_PER_BATCH, backfill, get_watermark
+
+class Command(BaseCommand):
+    help = 'Rebuild the daily property stats from the raw views and favorites'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--since', help='First day to rebuild (YYYY-MM-DD); defaults to the first recorded event')
+        parser.add_argument('--days-per-batch', type=int, default=BACKFILL_DAYS_PER_BATCH, help='Days aggregated per query')
+
+    def handle(self, *args, **options):
+        since = None
+        if options['since']:
+            try:
+                since = date.fromisoformat(options['since'])
+            except ValueError:
+                raise CommandError('--since must be a date in YYYY-MM-DD format')
+
+        def report(day, written):
+            self.stdout.write(f'Rebuilt from {day}: {written} rows so far')
+
+        written = backfill(since, options['days_per_batch'], on_progress=report)
+        self.stdout.write(self.style.SUCCESS(f'{written} daily stats rows rebuilt up to {get_watermark()}'))
@@ -0,0 +1,103 @@
+import random
+import statistics
+import time
+from decimal import Decimal
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+
+from properties.models import Property
+from properties.search import search_properties
+
+User = get_user_model()
+
+CITIES = [
+    ('Bangalore', 'Karnataka'), ('Mumbai', 'Maharashtra'), ('Pune', 'Maharashtra'),
+    ('Delhi', 'Delhi'), ('Hyderabad', 'Telangana'), ('Chennai', 'Tamil Nadu'),
+    ('Kolkata', 'West Bengal'), ('Jaipur', 'Rajasthan'), ('Ahmedabad', 'Gujarat'),
+    ('Lucknow', 'Uttar Pradesh'), ('Indore', 'Madhya Pradesh'), ('Kochi', 'Kerala'),
+]
+
+LOCALITIES = [
+    'Koramangala', 'Indiranagar', 'Whitefield', 'Andheri', 'Bandra', 'Powai', 'Kothrud',
+    'Hinjewadi', 'Saket', 'Dwarka', 'Gachibowli', 'Madhapur', 'Adyar', 'Velachery',
+    'Salt Lake', 'Malviya Nagar', 'Navrangpura', 'Gomti Nagar', 'Vijay Nagar', 'Kakkanad',
+]
+
+WORDS = [
+    'spacious', 'bright', 'modern', 'cozy', 'furnished', 'balcony', 'garden', 'parking',
+    'metro', 'school', 'market', 'quiet', 'family', 'students', 'working', 'professionals',
+    'gym', 'pool', 'security', 'lift', 'terrace', 'view', 'newly', 'renovated', 'airy',
+    'kitchen', 'wardrobe', 'power', 'backup', 'water', 'supply', 'gated', 'community',
+]
+
+QUERIES = ['Koramangala', 'metro parking', 'Gachibowli gym', 'lakeside penthouse', 'Kochi terrace view']
+
+class Command(BaseCommand):
+    help = 'Benchmark full-text property search against the icontains path on a generated catalogue'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--size', type=int, default=1_000_000, help='Number of listings to generate')
+        parser.add_argument('--batch-size', type=int, default=10_000, help='Rows per bulk insert')
+        parser.add_argument('--repeat', type=int, default=5, help='Timed runs per query and backend')
+        parser.add_argument('--limit', type=int, default=20, help='Rows fetched per query, i.e. one page')
+        parser.add_argument('--keep', action='store_true', help='Keep the generated catalogue instead of rolling back')
+
+    def handle(self, *args, **options):
+        rng = random.Random(513)
+
+        with transaction.atomic():
+            owner = User.objects.create_user(
+                email=f'benchmark-{int(time.time())}@example.com',
+                name='Benchmark Provider',
+                role='provider',
+            )
+            self._generate(owner, options['size'], options['batch_size'], rng)
+
+            with connection.cursor() as cursor:
+                cursor.execute('ANALYZE properties_property')
+
+            base = Property.objects.filter(isActive=True)
+            for query in QUERIES:
+                for backend in ('icontains', 'fulltext'):
+                    timings = []
+                    for _ in range(options['repeat']):
+                        start = time.perf_counter()
+                        ids = list(
+                            search_properties(base, query, backend=backend)
+                            .values_list('id', flat=True)[:options['limit']]
+                        )
+                        timings.append((time.perf_counter() - start) * 1000)
+                    self.stdout.write(
+                        f"{query!r:<24} {backend:<10} rows={len(ids):<4} "
+                        f"median={statistics.median(timings):9.2f}ms max={max(timings):9.2f}ms"
+                    )
+
+            if not options['keep']:
+                transaction.set_rollback(True)
+
+    def _generate(self, owner, size, batch_size, rng):
+        created = 0
+        while created < size:
+            batch = []
+            for _ in range(min(batch_size, size - created)):
+                city, state = rng.choice(CITIES)
+                locality = rng.choice(LOCALITIES)
+                price = Decimal(rng.randrange(3000, 150000, 500))
+                batch.append(Property(
+                    type=rng.choice(Property.PROPERTY_TYPES)[0],
+                    category=rng.choice(Property.CATEGORIES)[0],
+                    listingType=rng.choice(Property.LISTING_TYPES)[0],
+                    title=f"{' '.join(rng.sample(WORDS, 3)).title()} home in {locality}",
+                    description=' '.join(rng.choices(WORDS, k=40)),
+                    minimumPrice=price,
+                    maximumPrice=price + rng.randrange(0, 20000, 500),
+                    location=f'{locality}, {city}',
+                    city=city,
+                    state=state,
+                    owner=owner,
+                ))
+            Property.objects.bulk_create(batch, batch_size=batch_size)
+            created += len(batch)
+            self.stdout.write(f'Generated {created}/{size} listings')
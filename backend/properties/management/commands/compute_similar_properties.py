@@ -0,0 +1,79 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from properties.models import Property
+from properties.similarity import (
+    SYNC_OVERLAP, TOP_K, SimilarityIndex, last_computed_at, rebuild_similar_properties, update_similar_properties,
+)
+
+class Command(BaseCommand):
+    help = 'Precompute the most similar active listings of each property'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--top-k', type=int, default=TOP_K, help='Neighbours stored per listing')
+        parser.add_argument(
+            '--incremental', action='store_true',
+            help='Only refresh listings affected by properties changed since the last run'
+        )
+        parser.add_argument('--property', action='append', default=[], help='Refresh after this property changed (repeatable)')
+        parser.add_argument(
+            '--follow', action='store_true',
+            help='Keep running, refreshing neighbours as properties change; the matrices stay in memory between polls'
+        )
+        parser.add_argument('--interval', type=float, default=30, help='Seconds between polls with --follow')
+
+    def changed_since_last_run(self):
+        watermark = last_computed_at()
+        if watermark is None:
+            return None
+        return list(Property.objects.filter(updatedAt__gte=watermark - SYNC_OVERLAP).values_list('id', flat=True))
+
+    def handle(self, *args, **options):
+        start = time.perf_counter()
+        k = options['top_k']
+
+        if options['follow']:
+            return self.follow(k, options['interval'])
+
+        changed = list(options['property'])
+        if options['incremental']:
+            since_last_run = self.changed_since_last_run()
+            if since_last_run is None:
+                self.stdout.write('No previous run found, rebuilding everything')
+            else:
+                changed += since_last_run
+                if not changed:
+                    self.stdout.write('No properties changed since the last run')
+                    return
+
+        if changed:
+            affected = update_similar_properties(changed, k=k)
+            self.stdout.write(self.style.SUCCESS(
+                f'Refreshed neighbours of {len(affected)} listings after {len(changed)} changes '
+                f'in {time.perf_counter() - start:.2f}s'
+            ))
+        else:
+            total = rebuild_similar_properties(k=k)
+            self.stdout.write(self.style.SUCCESS(
+                f'Computed neighbours of {total} listings in {time.perf_counter() - start:.2f}s'
+            ))
+
+    def follow(self, k, interval):
+        """Poll the updatedAt watermark and refresh the affected neighbours until interrupted"""
+        if last_computed_at() is None:
+            total = rebuild_similar_properties(k=k)
+            self.stdout.write(f'Computed neighbours of {total} listings')
+        # Catch up on the changes made since the table was last written; later
+        # polls pick up new ones through the index
+        changed = self.changed_since_last_run() or []
+        index = SimilarityIndex()
+        while True:
+            start = time.perf_counter()
+            affected = update_similar_properties(changed, k=k, index=index)
+            if affected:
+                self.stdout.write(
+                    f'Refreshed neighbours of {len(affected)} listings in {time.perf_counter() - start:.2f}s'
+                )
+            changed = []
+            time.sleep(interval)
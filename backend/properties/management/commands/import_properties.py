@@ -0,0 +1,58 @@
+import csv
+import sys
+import time
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+
+from properties.imports import DEFAULT_BATCH_SIZE, IMPORT_FORMATS, detect_format, import_properties, open_text, read_rows
+
+User = get_user_model()
+
+class Command(BaseCommand):
+    help = 'Bulk import listings for a provider from a CSV or JSONL file, reporting rejected rows'
+
+    def add_arguments(self, parser):
+        parser.add_argument('path', help='CSV or JSONL file to import')
+        parser.add_argument('--owner', required=True, help='Email or id of the provider who owns the listings')
+        parser.add_argument('--format', choices=IMPORT_FORMATS, help='Defaults to the file extension')
+        parser.add_argument('--batch-size', type=int, default=DEFAULT_BATCH_SIZE, help='Rows validated and inserted per chunk')
+        parser.add_argument('--report', help='Write rejected rows to this CSV file instead of stdout')
+        parser.add_argument('--dry-run', action='store_true', help='Validate without inserting anything')
+
+    def handle(self, *args, **options):
+        owner = User.objects.filter(email=options['owner']).first() or User.objects.filter(id=options['owner']).first()
+        if owner is None:
+            raise CommandError(f"No user found for {options['owner']}")
+        if owner.role != 'provider':
+            raise CommandError(f'{owner.email} is not a provider')
+
+        file_format = options['format'] or detect_format(options['path'])
+        report_file = open(options['report'], 'w', newline='') if options['report'] else None
+        report = csv.writer(report_file or sys.stdout)
+        report.writerow(['line', 'field', 'error'])
+
+        def write_error(line, detail):
+            for field, messages in (detail.items() if isinstance(detail, dict) else [('non_field_errors', detail)]):
+                for message in messages if isinstance(messages, list) else [messages]:
+                    report.writerow([line, field, message])
+
+        start = time.perf_counter()
+        try:
+            with open(options['path'], 'rb') as f:
+                result = import_properties(
+                    read_rows(open_text(f), file_format),
+                    owner=owner,
+                    batch_size=options['batch_size'],
+                    dry_run=options['dry_run'],
+                    on_error=write_error,
+                )
+        finally:
+            if report_file:
+                report_file.close()
+
+        verb = 'Validated' if options['dry_run'] else 'Imported'
+        self.stdout.write(self.style.SUCCESS(
+            f"{verb} {result['created']} listings, rejected {result['failed']} rows "
+            f"in {time.perf_counter() - start:.2f}s"
+        ))
@@ -0,0 +1,23 @@
+from django.core.management.base import BaseCommand
+
+from properties.counters import drifted_properties, reconcile_counters
+
+class Command(BaseCommand):
+    help = 'Recompute view, favorite and unique viewer counters for properties whose stored values drifted'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=1000, help='Properties repaired per UPDATE')
+        parser.add_argument('--dry-run', action='store_true', help='Only report how many properties drifted')
+
+    def handle(self, *args, **options):
+        drifted = list(drifted_properties().values_list('pk', flat=True))
+        self.stdout.write(f'{len(drifted)} properties have drifted counters')
+        if options['dry_run'] or not drifted:
+            return
+
+        batch_size = options['batch_size']
+        repaired = 0
+        for start in range(0, len(drifted), batch_size):
+            repaired += reconcile_counters(drifted[start:start + batch_size])
+            self.stdout.write(f'Repaired {repaired}/{len(drifted)} properties')
+        self.stdout.write(self.style.SUCCESS('Counters reconciled'))
@@ -0,0 +1,10 @@
+from django.core.management.base import BaseCommand
+
+from properties.rollups import get_watermark, roll_up
+
+class Command(BaseCommand):
+    help = 'Fold views and favorites recorded since the last run into the daily property stats'
+
+    def handle(self, *args, **options):
+        written = roll_up()
+        self.stdout.write(self.style.SUCCESS(f'{written} daily stats rows updated, rolled up to {get_watermark()}'))
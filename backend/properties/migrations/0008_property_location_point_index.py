@@ -0,0 +1,22 @@
+# Generated by Django 5.2.6 on 2026-10-18 00:36
+
+import django.contrib.postgres.indexes
+import django.db.models.functions.comparison
+import properties.geo
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('properties', '0007_property_trigram_indexes'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='property',
+            index=django.contrib.postgres.indexes.GistIndex(properties.geo.GeoPoint(django.db.models.functions.comparison.Cast('longitude', models.FloatField()), django.db.models.functions.comparison.Cast('latitude', models.FloatField())), name='property_location_point_idx'),
+        ),
+    ]
@@ -0,0 +1,19 @@
+# Generated by Django 5.2.6 on 2026-10-18 00:37
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('properties', '0008_property_location_point_index'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='property',
+            index=models.Index(fields=['-createdAt', '-id'], name='property_created_id_idx'),
+        ),
+    ]
@@ -0,0 +1,51 @@
+# Generated by Django 5.2.6 on 2026-10-18 00:38
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('properties', '0009_property_created_id_index'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='property',
+            name='property_created_id_idx',
+        ),
+        migrations.AddIndex(
+            model_name='property',
+            index=models.Index(condition=models.Q(('isActive', True)), fields=['-createdAt', '-id'], name='property_created_id_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='property',
+            index=models.Index(condition=models.Q(('isActive', True)), fields=['owner', '-createdAt', '-id'], name='property_owner_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='property',
+            index=models.Index(condition=models.Q(('isActive', True)), fields=['category', '-createdAt', '-id'], name='property_category_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='property',
+            index=models.Index(condition=models.Q(('isActive', True)), fields=['listingType', '-createdAt', '-id'], name='property_listing_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='property',
+            index=models.Index(condition=models.Q(('isActive', True)), fields=['type', '-createdAt', '-id'], name='property_type_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='property',
+            index=models.Index(condition=models.Q(('isActive', True)), fields=['availability', '-createdAt', '-id'], name='property_avail_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='property',
+            index=models.Index(condition=models.Q(('isActive', True)), fields=['city', '-createdAt', '-id'], name='property_city_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='property',
+            index=models.Index(condition=models.Q(('isActive', True)), fields=['minimumPrice', 'id'], name='property_min_price_idx'),
+        ),
+    ]
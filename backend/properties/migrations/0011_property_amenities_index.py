@@ -0,0 +1,20 @@
+# Generated by Django 5.2.6 on 2026-10-18 00:41
+
+import django.contrib.postgres.indexes
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('properties', '0010_property_active_indexes'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='property',
+            index=django.contrib.postgres.indexes.GinIndex(condition=models.Q(('isActive', True)), fields=['amenities'], name='property_amenities_idx', opclasses=['jsonb_path_ops']),
+        ),
+    ]
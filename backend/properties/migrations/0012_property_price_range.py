@@ -0,0 +1,27 @@
+# Generated by Django 5.2.6 on 2026-10-18 00:42
+
+import django.contrib.postgres.fields.ranges
+import django.contrib.postgres.indexes
+import django.db.models.functions.comparison
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('properties', '0011_property_amenities_index'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='property',
+            name='priceRange',
+            field=models.GeneratedField(db_persist=True, expression=models.Func(models.F('minimumPrice'), django.db.models.functions.comparison.Greatest(models.F('minimumPrice'), django.db.models.functions.comparison.Coalesce(models.F('maximumPrice'), models.F('minimumPrice'))), models.Value('[]'), function='numrange', output_field=django.contrib.postgres.fields.ranges.DecimalRangeField()), output_field=django.contrib.postgres.fields.ranges.DecimalRangeField()),
+        ),
+        migrations.AddIndex(
+            model_name='property',
+            index=django.contrib.postgres.indexes.GistIndex(condition=models.Q(('isActive', True)), fields=['priceRange'], name='property_price_range_idx'),
+        ),
+    ]
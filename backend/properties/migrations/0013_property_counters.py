@@ -0,0 +1,56 @@
+# Generated by Django 5.2.6 on 2026-10-18 00:49
+
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import Count, IntegerField, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+
+def backfill_counters(apps, schema_editor):
+    Property = apps.get_model('properties', 'Property')
+    Favorite = apps.get_model('properties', 'Favorite')
+    PropertyView = apps.get_model('properties', 'PropertyView')
+
+    def count(queryset, field='id', distinct=False):
+        return Coalesce(Subquery(
+            queryset.filter(property=OuterRef('pk')).order_by().values('property')
+            .annotate(total=Count(field, distinct=distinct)).values('total'),
+            output_field=IntegerField(),
+        ), 0)
+
+    Property.objects.update(
+        viewCount=count(PropertyView.objects.all()),
+        favoriteCount=count(Favorite.objects.all()),
+        uniqueViewerCount=count(PropertyView.objects.filter(user__isnull=False), 'user', distinct=True),
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('properties', '0012_property_price_range'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='property',
+            name='favoriteCount',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='property',
+            name='uniqueViewerCount',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='property',
+            name='viewCount',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddIndex(
+            model_name='propertyview',
+            index=models.Index(fields=['property', 'user'], name='propview_property_user_idx'),
+        ),
+        migrations.RunPython(backfill_counters, migrations.RunPython.noop),
+    ]
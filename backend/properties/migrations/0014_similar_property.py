@@ -0,0 +1,32 @@
+# Generated by Django 5.2.6 on 2026-10-18 00:52
+
+import django.db.models.deletion
+import django.utils.timezone
+import properties.models
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('properties', '0013_property_counters'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SimilarProperty',
+            fields=[
+                ('id', models.CharField(default=properties.models.generate_unique_id, editable=False, max_length=16, primary_key=True, serialize=False)),
+                ('score', models.FloatField()),
+                ('rank', models.PositiveSmallIntegerField()),
+                ('computedAt', models.DateTimeField(default=django.utils.timezone.now)),
+                ('property', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='similar_properties', to='properties.property')),
+                ('similar', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='similar_to', to='properties.property')),
+            ],
+            options={
+                'ordering': ['property', 'rank'],
+                'indexes': [models.Index(fields=['property', 'rank'], name='similar_property_rank_idx')],
+                'unique_together': {('property', 'similar')},
+            },
+        ),
+    ]
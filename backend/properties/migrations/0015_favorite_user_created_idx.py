@@ -0,0 +1,19 @@
+# Generated by Django 5.2.6 on 2026-10-18 01:09
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('properties', '0014_similar_property'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='favorite',
+            index=models.Index(fields=['user', '-createdAt', '-id'], name='favorite_user_created_idx'),
+        ),
+    ]
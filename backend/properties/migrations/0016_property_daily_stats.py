@@ -0,0 +1,67 @@
+# Generated by Django 5.2.6 on 2026-10-18 01:12
+
+import django.db.models.deletion
+import utils.ids
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('properties', '0015_favorite_user_created_idx'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='PropertyDailyStats',
+            fields=[
+                ('id', models.CharField(default=utils.ids.generate_unique_id, editable=False, max_length=16, primary_key=True, serialize=False)),
+                ('date', models.DateField()),
+                ('views', models.PositiveIntegerField(default=0)),
+                ('uniqueViewers', models.PositiveIntegerField(default=0)),
+                ('favorites', models.PositiveIntegerField(default=0)),
+            ],
+            options={
+                'ordering': ['property', '-date'],
+            },
+        ),
+        migrations.CreateModel(
+            name='RollupWatermark',
+            fields=[
+                ('name', models.CharField(max_length=50, primary_key=True, serialize=False)),
+                ('watermark', models.DateTimeField()),
+                ('updatedAt', models.DateTimeField(auto_now=True)),
+            ],
+        ),
+        migrations.AddIndex(
+            model_name='favorite',
+            index=models.Index(fields=['createdAt'], name='favorite_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='favorite',
+            index=models.Index(fields=['property', 'createdAt'], name='favorite_property_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='propertyview',
+            index=models.Index(fields=['createdAt'], name='propview_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='propertyview',
+            index=models.Index(fields=['property', 'createdAt'], name='propview_property_created_idx'),
+        ),
+        migrations.AddField(
+            model_name='propertydailystats',
+            name='property',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='daily_stats', to='properties.property'),
+        ),
+        migrations.AddIndex(
+            model_name='propertydailystats',
+            index=models.Index(fields=['date'], name='daily_stats_date_idx'),
+        ),
+        migrations.AlterUniqueTogether(
+            name='propertydailystats',
+            unique_together={('property', 'date')},
+        ),
+    ]
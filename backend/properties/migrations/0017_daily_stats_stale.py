@@ -0,0 +1,22 @@
+# Generated by Django 5.2.6 on 2026-10-18 01:28
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('properties', '0016_property_daily_stats'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='propertydailystats',
+            name='stale',
+            field=models.BooleanField(default=False),
+        ),
+        migrations.AddIndex(
+            model_name='propertydailystats',
+            index=models.Index(condition=models.Q(('stale', True)), fields=['date'], name='daily_stats_stale_idx'),
+        ),
+    ]
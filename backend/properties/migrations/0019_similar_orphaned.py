@@ -0,0 +1,23 @@
+# Generated by Django 5.2.6 on 2026-10-18 01:45
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('properties', '0018_property_updated_idx'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='similarproperty',
+            name='similar',
+            field=models.ForeignKey(null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='similar_to', to='properties.property'),
+        ),
+        migrations.AddIndex(
+            model_name='similarproperty',
+            index=models.Index(condition=models.Q(('similar__isnull', True)), fields=['property'], name='similar_orphaned_idx'),
+        ),
+    ]
@@ -0,0 +1,55 @@
+# Generated by Django 5.2.6 on 2026-10-18 01:51
+
+import django.db.models.deletion
+import utils.ids
+from django.conf import settings
+from django.db import migrations, models
+
+
+def backfill_viewers(apps, schema_editor):
+    # Viewers behind an existing watermark; later ones come from roll_up
+    RollupWatermark = apps.get_model('properties', 'RollupWatermark')
+    PropertyView = apps.get_model('properties', 'PropertyView')
+    ProviderViewer = apps.get_model('properties', 'ProviderViewer')
+
+    mark = RollupWatermark.objects.filter(name='property_daily_stats').first()
+    if mark is None:
+        return
+    pairs = (
+        PropertyView.objects.filter(createdAt__lt=mark.watermark, user__isnull=False)
+        .order_by().values_list('property__owner_id', 'user_id').distinct()
+    )
+    batch = []
+    for provider_id, viewer_id in pairs.iterator(chunk_size=5000):
+        batch.append(ProviderViewer(provider_id=provider_id, viewer_id=viewer_id))
+        if len(batch) >= 5000:
+            ProviderViewer.objects.bulk_create(batch, ignore_conflicts=True)
+            batch = []
+    ProviderViewer.objects.bulk_create(batch, ignore_conflicts=True)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('properties', '0019_similar_orphaned'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.RemoveField(
+            model_name='propertydailystats',
+            name='uniqueViewers',
+        ),
+        migrations.CreateModel(
+            name='ProviderViewer',
+            fields=[
+                ('id', models.CharField(default=utils.ids.generate_unique_id, editable=False, max_length=16, primary_key=True, serialize=False)),
+                ('provider', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='listing_viewers', to=settings.AUTH_USER_MODEL)),
+                ('viewer', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'unique_together': {('provider', 'viewer')},
+            },
+        ),
+        migrations.RunPython(backfill_viewers, migrations.RunPython.noop),
+    ]
@@ -1,15 +1,20 @@
 from django.db import models
+from django.db.models import F, Func, Q, Value
 from django.contrib.auth import get_user_model
+from django.contrib.postgres.fields import DecimalRangeField
+from django.contrib.postgres.indexes import GinIndex, GistIndex, OpClass
+from django.contrib.postgres.search import SearchVector, SearchVectorField
 from django.core.validators import MinValueValidator
+from django.utils import timezone
+from django.db.models.functions import Coalesce, Greatest, Upper
+from .geo import location_point
+from utils.ids import generate_unique_id
 from decimal import Decimal
-import secrets
-import string
 
 User = get_user_model()
 
-def generate_unique_id():
-    """Generate a unique 16-digit alphanumeric ID"""
-    return ''.join(secrets.choice(string.ascii_uppercase + string.digits) for _ in range(16))
+# Property columns that only change through F() increments
+COUNTER_FIELDS = ('viewCount', 'favoriteCount', 'uniqueViewerCount')
 
 class Property(models.Model):
     PROPERTY_TYPES = [
@@ -101,6 +106,17 @@ class Property(models.Model):
     deposit = models.CharField(max_length=100, blank=True)
     minimumPrice = models.DecimalField(max_digits=10, decimal_places=2, validators=[MinValueValidator(Decimal('0.00'))])
     maximumPrice = models.DecimalField(max_digits=10, decimal_places=2, validators=[MinValueValidator(Decimal('0.00'))], blank=True, null=True)
+    priceRange = models.GeneratedField(
+        expression=Func(
+            F('minimumPrice'),
+            Greatest(F('minimumPrice'), Coalesce(F('maximumPrice'), F('minimumPrice'))),
+            Value('[]'),
+            function='numrange',
+            output_field=DecimalRangeField(),
+        ),
+        output_field=DecimalRangeField(),
+        db_persist=True,
+    )
     
     # Property Details
     areaSize = models.CharField(max_length=50, blank=True)
@@ -127,28 +143,79 @@ class Property(models.Model):
     owner = models.ForeignKey(User, on_delete=models.CASCADE, related_name='properties')
     isActive = models.BooleanField(default=True)
     
+    # Engagement counters, maintained by signals and repaired by reconcile_property_counters
+    viewCount = models.PositiveIntegerField(default=0)
+    favoriteCount = models.PositiveIntegerField(default=0)
+    uniqueViewerCount = models.PositiveIntegerField(default=0)
+    
     # Timestamps
     createdAt = models.DateTimeField(auto_now_add=True)
     updatedAt = models.DateTimeField(auto_now=True)
     
+    # Weighted full-text search document, kept up to date by Postgres
+    searchVector = models.GeneratedField(
+        expression=(
+            SearchVector('title', weight='A', config='english')
+            + SearchVector('location', 'city', weight='B', config='english')
+            + SearchVector('description', weight='C', config='english')
+        ),
+        output_field=SearchVectorField(),
+        db_persist=True,
+    )
+    
     class Meta:
         verbose_name_plural = 'Properties'
         ordering = ['-createdAt']
+        indexes = [
+            # Partial indexes for the active-listing query shapes: an equality
+            # filter followed by the (createdAt, id) cursor ordering
+            models.Index(fields=['-createdAt', '-id'], name='property_created_id_idx', condition=Q(isActive=True)),
+            models.Index(fields=['owner', '-createdAt', '-id'], name='property_owner_created_idx', condition=Q(isActive=True)),
+            models.Index(fields=['category', '-createdAt', '-id'], name='property_category_created_idx', condition=Q(isActive=True)),
+            models.Index(fields=['listingType', '-createdAt', '-id'], name='property_listing_created_idx', condition=Q(isActive=True)),
+            models.Index(fields=['type', '-createdAt', '-id'], name='property_type_created_idx', condition=Q(isActive=True)),
+            models.Index(fields=['availability', '-createdAt', '-id'], name='property_avail_created_idx', condition=Q(isActive=True)),
+            models.Index(fields=['city', '-createdAt', '-id'], name='property_city_created_idx', condition=Q(isActive=True)),
+            models.Index(fields=['minimumPrice', 'id'], name='property_min_price_idx', condition=Q(isActive=True)),
+            # Listings changed since a watermark, for incremental similarity updates
+            models.Index(fields=['updatedAt'], name='property_updated_idx'),
+            GistIndex(fields=['priceRange'], name='property_price_range_idx', condition=Q(isActive=True)),
+            GinIndex(fields=['searchVector'], name='property_search_vector_idx'),
+            # UPPER() matches the SQL Django emits for icontains, so these
+            # serve both substring and trigram similarity lookups
+            GinIndex(OpClass(Upper('title'), name='gin_trgm_ops'), name='property_title_trgm_idx'),
+            GinIndex(OpClass(Upper('city'), name='gin_trgm_ops'), name='property_city_trgm_idx'),
+            GinIndex(OpClass(Upper('location'), name='gin_trgm_ops'), name='property_location_trgm_idx'),
+            GistIndex(location_point(), name='property_location_point_idx'),
+            GinIndex(fields=['amenities'], name='property_amenities_idx', opclasses=['jsonb_path_ops'], condition=Q(isActive=True)),
+        ]
     
     def __str__(self):
         return f"{self.title} - {self.get_type_display()}"
     
+    def save(self, *args, **kwargs):
+        # Writing back the counters loaded with the instance would undo the
+        # increments committed since, so ordinary saves leave them out
+        if not self._state.adding and kwargs.get('update_fields') is None and not kwargs.get('force_insert'):
+            deferred = self.get_deferred_fields()
+            kwargs['update_fields'] = [
+                field.name for field in self._meta.concrete_fields
+                if not field.primary_key and not field.generated
+                and field.name not in COUNTER_FIELDS and field.attname not in deferred
+            ]
+        super().save(*args, **kwargs)
+    
     @property
     def total_views(self):
-        return self.views.count()
+        return self.viewCount
     
     @property
     def total_favorites(self):
-        return self.favorited_by.count()
+        return self.favoriteCount
     
     @property
     def unique_viewers(self):
-        return self.views.filter(user__isnull=False).values('user').distinct().count()
+        return self.uniqueViewerCount
 
 class Favorite(models.Model):
     """Model for user favorites - like Instagram likes"""
@@ -160,6 +227,13 @@ class Favorite(models.Model):
     class Meta:
         unique_together = ('user', 'property')  
         ordering = ['-createdAt']
+        indexes = [
+            # Serves the seeker's favorites list in cursor order
+            models.Index(fields=['user', '-createdAt', '-id'], name='favorite_user_created_idx'),
+            # Range scans of the daily stats rollup
+            models.Index(fields=['createdAt'], name='favorite_created_idx'),
+            models.Index(fields=['property', 'createdAt'], name='favorite_property_created_idx'),
+        ]
     
     def __str__(self):
         return f"{self.user.name} favorited {self.property.title}"
@@ -175,7 +249,85 @@ class PropertyView(models.Model):
     
     class Meta:
         ordering = ['-createdAt']
+        indexes = [
+            models.Index(fields=['property', 'user'], name='propview_property_user_idx'),
+            # Range scans of the daily stats rollup
+            models.Index(fields=['createdAt'], name='propview_created_idx'),
+            models.Index(fields=['property', 'createdAt'], name='propview_property_created_idx'),
+        ]
     
     def __str__(self):
         user_info = self.user.name if self.user else f"Anonymous ({self.ip_address})"
         return f"{user_info} viewed {self.property.title}"
+
+class SimilarProperty(models.Model):
+    """Precomputed nearest neighbours of a listing, written by compute_similar_properties"""
+    id = models.CharField(max_length=16, primary_key=True, default=generate_unique_id, editable=False)
+    property = models.ForeignKey(Property, on_delete=models.CASCADE, related_name='similar_properties')
+    # A deleted neighbour leaves its row behind with no similar listing, so
+    # the next incremental run knows which neighbour lists to recompute
+    similar = models.ForeignKey(Property, on_delete=models.SET_NULL, null=True, related_name='similar_to')
+    score = models.FloatField()
+    rank = models.PositiveSmallIntegerField()
+    computedAt = models.DateTimeField(default=timezone.now)
+    
+    class Meta:
+        ordering = ['property', 'rank']
+        unique_together = ('property', 'similar')
+        indexes = [
+            models.Index(fields=['property', 'rank'], name='similar_property_rank_idx'),
+            models.Index(fields=['property'], condition=Q(similar__isnull=True), name='similar_orphaned_idx'),
+        ]
+    
+    def __str__(self):
+        return f"{self.similar_id} is #{self.rank} similar to {self.property_id}"
+
+class PropertyDailyStats(models.Model):
+    """Views and favorites of a listing per day, rolled up from the raw events.
+    
+    favorites counts the favorites created that day which still exist; stale
+    marks a day whose favorites were removed since and must be recounted.
+    Unique viewers do not add up across days, so they are rolled up per
+    provider in ProviderViewer instead.
+    """
+    id = models.CharField(max_length=16, primary_key=True, default=generate_unique_id, editable=False)
+    property = models.ForeignKey(Property, on_delete=models.CASCADE, related_name='daily_stats')
+    date = models.DateField()
+    views = models.PositiveIntegerField(default=0)
+    favorites = models.PositiveIntegerField(default=0)
+    stale = models.BooleanField(default=False)
+    
+    class Meta:
+        ordering = ['property', '-date']
+        unique_together = ('property', 'date')
+        indexes = [
+            models.Index(fields=['date'], name='daily_stats_date_idx'),
+            models.Index(fields=['date'], condition=Q(stale=True), name='daily_stats_stale_idx'),
+        ]
+    
+    def __str__(self):
+        return f"{self.property_id} on {self.date}"
+
+class ProviderViewer(models.Model):
+    """A signed-in user who viewed any of a provider's listings, rolled up with the daily stats.
+    
+    Viewers of listings deleted since stay counted.
+    """
+    id = models.CharField(max_length=16, primary_key=True, default=generate_unique_id, editable=False)
+    provider = models.ForeignKey(User, on_delete=models.CASCADE, related_name='listing_viewers')
+    viewer = models.ForeignKey(User, on_delete=models.CASCADE, related_name='+')
+    
+    class Meta:
+        unique_together = ('provider', 'viewer')
+    
+    def __str__(self):
+        return f"{self.viewer_id} viewed listings of {self.provider_id}"
+
+class RollupWatermark(models.Model):
+    """Creation time up to which a rollup has aggregated the raw events"""
+    name = models.CharField(max_length=50, primary_key=True)
+    watermark = models.DateTimeField()
+    updatedAt = models.DateTimeField(auto_now=True)
+    
+    def __str__(self):
+        return f"{self.name} at {self.watermark}"
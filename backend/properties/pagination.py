@@ -0,0 +1,41 @@
+import json
+from rest_framework.pagination import CursorPagination
+
+def estimated_count(queryset):
+    """Planner's row estimate for a queryset, read from EXPLAIN instead of running COUNT(*)"""
+    plan = json.loads(queryset.order_by().explain(format='json'))
+    return int(plan[0]['Plan']['Plan Rows'])
+
+class PropertyCursorPagination(CursorPagination):
+    """Keyset pagination on (createdAt, id) for infinite scroll.
+    
+    Pass include_total=estimate to get an approximate total from planner statistics.
+    """
+    page_size = 20
+    page_size_query_param = 'page_size'
+    max_page_size = 100
+    ordering = ('-createdAt', '-id')
+    
+    def get_ordering(self, request, queryset, view):
+        # Ranked querysets (search relevance, similarity, distance) keep their own ordering
+        order_by = queryset.query.order_by
+        if order_by and all(isinstance(field, str) for field in order_by):
+            return tuple(order_by)
+        return super().get_ordering(request, queryset, view)
+    
+    def paginate_queryset(self, queryset, request, view=None):
+        self.estimated_total = None
+        if request.query_params.get('include_total') == 'estimate':
+            self.estimated_total = estimated_count(queryset)
+        return super().paginate_queryset(queryset, request, view)
+    
+    def get_paginated_response(self, data):
+        response = super().get_paginated_response(data)
+        if self.estimated_total is not None:
+            response.data['estimated_total'] = self.estimated_total
+        return response
+    
+    def get_paginated_response_schema(self, schema):
+        schema = super().get_paginated_response_schema(schema)
+        schema['properties']['estimated_total'] = {'type': 'integer', 'nullable': True}
+        return schema
@@ -0,0 +1,55 @@
+import math
+from django.conf import settings
+from django.db.models import F, FloatField, Func, Value
+from django.db.models.functions import Cast, Exp
+from django.utils import timezone
+
+DEFAULT_RELEVANCE = {
+    'TEXT_WEIGHT': 0.6,
+    'RECENCY_WEIGHT': 0.25,
+    'POPULARITY_WEIGHT': 0.15,
+    'RECENCY_HALF_LIFE_DAYS': 30,
+    'FAVORITE_WEIGHT': 5,
+    'VIEW_WEIGHT': 1,
+    'POPULARITY_SATURATION': 50,
+}
+
+class AgeInDays(Func):
+    """Days elapsed between a timestamp column and a reference time"""
+    template = '(EXTRACT(EPOCH FROM (%(expressions)s)) / 86400.0)'
+    arg_joiner = ' - '
+    output_field = FloatField()
+
+def relevance_settings():
+    return {**DEFAULT_RELEVANCE, **getattr(settings, 'PROPERTY_RELEVANCE', {})}
+
+def relevance_score():
+    """SQL expression blending text rank, recency and engagement into one score.
+    
+    The text part reuses the search_rank annotation when present, recency decays
+    with a configurable half-life and popularity saturates on the denormalized
+    counters, so no component needs more than the row itself.
+    """
+    weights = relevance_settings()
+    # Whole hours keep scores, and so cursors and cache entries, stable between pages
+    reference = timezone.now().replace(minute=0, second=0, microsecond=0)
+    
+    decay = math.log(2) / weights['RECENCY_HALF_LIFE_DAYS']
+    recency = Exp(AgeInDays(Value(reference), F('createdAt')) * -decay)
+    
+    engagement = Cast(
+        F('favoriteCount') * weights['FAVORITE_WEIGHT'] + F('viewCount') * weights['VIEW_WEIGHT'],
+        FloatField(),
+    )
+    popularity = engagement / (engagement + weights['POPULARITY_SATURATION'])
+    
+    score = recency * weights['RECENCY_WEIGHT'] + popularity * weights['POPULARITY_WEIGHT']
+    return score, weights
+
+def order_by_relevance(queryset):
+    """Order a searched queryset by the blended relevance score"""
+    score, weights = relevance_score()
+    if 'search_rank' in queryset.query.annotations:
+        text = F('search_rank') / (F('search_rank') + 1.0)
+        score = score + text * weights['TEXT_WEIGHT']
+    return queryset.annotate(relevance=score).order_by('-relevance', '-createdAt', '-id')
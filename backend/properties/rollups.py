@@ -0,0 +1,218 @@
+from collections import defaultdict
+from datetime import datetime, time, timedelta
+from django.db import transaction
+from django.db.models import Count, Min
+from django.db.models.functions import TruncDate
+from django.utils import timezone
+from .models import Favorite, Property, PropertyDailyStats, PropertyView, ProviderViewer, RollupWatermark
+
+ROLLUP_NAME = 'property_daily_stats'
+# Events are rolled up only once this old, so rows still being committed
+# (e.g. buffered views) cannot land behind the watermark
+SETTLE_DELAY = timedelta(minutes=5)
+BATCH_SIZE = 1000
+BACKFILL_DAYS_PER_BATCH = 7
+
+def _day_start(day):
+    return timezone.make_aware(datetime.combine(day, time.min))
+
+def get_watermark():
+    """Creation time before which every view and favorite is in the rollup, or None"""
+    return RollupWatermark.objects.filter(name=ROLLUP_NAME).values_list('watermark', flat=True).first()
+
+def _locked_watermark():
+    return RollupWatermark.objects.select_for_update().filter(name=ROLLUP_NAME).first()
+
+def _set_watermark(value):
+    RollupWatermark.objects.update_or_create(name=ROLLUP_NAME, defaults={'watermark': value})
+
+def _empty_stats():
+    return {'views': 0, 'favorites': 0}
+
+def _per_day(queryset, **aggregates):
+    return (
+        queryset.annotate(date=TruncDate('createdAt')).order_by()
+        .values('property_id', 'date').annotate(**aggregates)
+    )
+
+def daily_counts(start, end, property_ids=None):
+    """Stats per (property id, day) of the events created in [start, end); favorites that still exist"""
+    lookups = {'createdAt__gte': start, 'createdAt__lt': end}
+    if property_ids is not None:
+        lookups['property_id__in'] = property_ids
+    stats = defaultdict(_empty_stats)
+    for row in _per_day(PropertyView.objects.filter(**lookups), total=Count('id')):
+        stats[(row['property_id'], row['date'])]['views'] = row['total']
+    for row in _per_day(Favorite.objects.filter(**lookups), total=Count('id')):
+        stats[(row['property_id'], row['date'])]['favorites'] = row['total']
+    return stats
+
+def write_stats(stats):
+    """Upsert (property id, day) stats, replacing any previous values of those days"""
+    PropertyDailyStats.objects.bulk_create(
+        [PropertyDailyStats(property_id=pk, date=date, **counts) for (pk, date), counts in stats.items()],
+        batch_size=BATCH_SIZE,
+        update_conflicts=True,
+        unique_fields=['property', 'date'],
+        update_fields=['views', 'favorites'],
+    )
+    return len(stats)
+
+def write_viewers(start, end):
+    """Record the providers whose listings got signed-in views created in [start, end), with the viewers"""
+    views = PropertyView.objects.filter(createdAt__lt=end, user__isnull=False)
+    if start is not None:
+        views = views.filter(createdAt__gte=start)
+    pairs = views.order_by().values_list('property__owner_id', 'user_id').distinct()
+    ProviderViewer.objects.bulk_create(
+        [ProviderViewer(provider_id=provider_id, viewer_id=viewer_id) for provider_id, viewer_id in pairs],
+        batch_size=BATCH_SIZE,
+        ignore_conflicts=True,
+    )
+
+def mark_stale(property_id, created_at):
+    """Have the next roll_up recount the day of a deleted favorite.
+
+    Rolled-up favorites are the ones that still exist, like the raw tail of
+    activity_totals, so a day whose favorite was removed must be recounted.
+    The flag is upserted: a roll_up writing the row concurrently keeps it.
+    """
+    if not Property.objects.filter(pk=property_id).exists():
+        return
+    PropertyDailyStats.objects.bulk_create(
+        [PropertyDailyStats(property_id=property_id, date=timezone.localdate(created_at), stale=True)],
+        update_conflicts=True,
+        unique_fields=['property', 'date'],
+        update_fields=['stale'],
+    )
+
+def roll_up(until=None):
+    """Re-aggregate the days of every listing with events since the watermark.
+
+    Only (listing, day) pairs that received new events or were marked stale
+    are recomputed, each from the start of its day up to the new watermark,
+    so a run costs the events of the touched days rather than the lifetime
+    history. Returns the number of rows written.
+    """
+    until = until or timezone.now() - SETTLE_DELAY
+    with transaction.atomic():
+        mark = _locked_watermark()
+        if mark is None:
+            # Nothing rolled up yet; build the whole history instead
+            written = _backfill_range(None, until)
+            _set_watermark(until)
+            return written
+        if mark.watermark >= until:
+            return 0
+
+        touched = defaultdict(set)
+        for model in (PropertyView, Favorite):
+            rows = _per_day(model.objects.filter(createdAt__gte=mark.watermark, createdAt__lt=until))
+            for row in rows.values_list('property_id', 'date').distinct():
+                touched[row[1]].add(row[0])
+
+        # Cleared before recounting, so a favorite removed meanwhile marks its day again
+        stale = list(PropertyDailyStats.objects.filter(stale=True).values_list('pk', 'property_id', 'date'))
+        PropertyDailyStats.objects.filter(pk__in=[pk for pk, _, _ in stale]).update(stale=False)
+        for _, property_id, day in stale:
+            touched[day].add(property_id)
+
+        written = 0
+        for day, property_ids in sorted(touched.items()):
+            end = min(_day_start(day + timedelta(days=1)), until)
+            stats = daily_counts(_day_start(day), end, property_ids)
+            # A day left without events still overwrites its previous counts
+            for property_id in property_ids:
+                stats.setdefault((property_id, day), _empty_stats())
+            written += write_stats(stats)
+        write_viewers(mark.watermark, until)
+        mark.watermark = until
+        mark.save()
+    return written
+
+def _earliest_event_day():
+    earliest = [
+        model.objects.aggregate(first=Min('createdAt'))['first']
+        for model in (PropertyView, Favorite)
+    ]
+    earliest = [value for value in earliest if value is not None]
+    return timezone.localdate(min(earliest)) if earliest else None
+
+def _backfill_range(since, until, days_per_batch=BACKFILL_DAYS_PER_BATCH, on_progress=None):
+    since = since or _earliest_event_day()
+    if since is None:
+        return 0
+    written = 0
+    day = since
+    while _day_start(day) < until:
+        end = min(_day_start(day + timedelta(days=days_per_batch)), until)
+        written += write_stats(daily_counts(_day_start(day), end))
+        write_viewers(_day_start(day), end)
+        if on_progress:
+            on_progress(day, written)
+        day += timedelta(days=days_per_batch)
+    return written
+
+def backfill(since=None, days_per_batch=BACKFILL_DAYS_PER_BATCH, on_progress=None):
+    """Rebuild the daily stats of every listing from since (default: the first event) to the watermark.
+
+    Runs under the watermark lock, so it never races the incremental job. When
+    no rollup exists yet the watermark is set to now minus SETTLE_DELAY.
+    """
+    with transaction.atomic():
+        mark = _locked_watermark()
+        until = mark.watermark if mark else timezone.now() - SETTLE_DELAY
+        written = _backfill_range(since, until, days_per_batch, on_progress)
+        if mark is None:
+            _set_watermark(until)
+    return written
+
+def activity_totals(windows, **property_filter):
+    """Views and favorites per listing over trailing windows of days, today included.
+
+    Reads the daily rollup rows of the windows and adds the raw events created
+    since the watermark, so totals stay current between rollup runs. Both
+    count the favorites that still exist. property_filter narrows the
+    listings, e.g. property__owner=user.
+    """
+    today = timezone.localdate()
+    starts = {days: today - timedelta(days=days - 1) for days in windows}
+    first_day = min(starts.values())
+    totals = defaultdict(lambda: {'views': dict.fromkeys(windows, 0), 'favorites': dict.fromkeys(windows, 0)})
+
+    def add(property_id, day, kind, count):
+        for days, start in starts.items():
+            if day >= start:
+                totals[property_id][kind][days] += count
+
+    rows = PropertyDailyStats.objects.filter(date__gte=first_day, **property_filter)
+    for property_id, day, views, favorites in rows.values_list('property_id', 'date', 'views', 'favorites'):
+        add(property_id, day, 'views', views)
+        add(property_id, day, 'favorites', favorites)
+
+    watermark = get_watermark()
+    tail_start = max(watermark, _day_start(first_day)) if watermark else _day_start(first_day)
+    for kind, model in (('views', PropertyView), ('favorites', Favorite)):
+        tail = _per_day(model.objects.filter(createdAt__gte=tail_start, **property_filter), total=Count('id'))
+        for row in tail:
+            add(row['property_id'], row['date'], kind, row['total'])
+    return totals
+
+def unique_viewers(provider):
+    """Signed-in users who viewed any of the provider's listings.
+    
+    Viewers up to the watermark come from ProviderViewer and only the views
+    created since are scanned, so the cost follows the provider's viewers
+    rather than its lifetime views.
+    """
+    views = PropertyView.objects.filter(property__owner=provider, user__isnull=False)
+    watermark = get_watermark()
+    if watermark is None:
+        return views.values('user').distinct().count()
+    rolled_up = ProviderViewer.objects.filter(provider=provider)
+    recent = (
+        views.filter(createdAt__gte=watermark)
+        .exclude(user__in=rolled_up.values('viewer'))
+        .values('user').distinct().count()
+    )
+    return rolled_up.count() + recent
@@ -0,0 +1,59 @@
+from django.conf import settings
+from django.contrib.postgres.search import SearchQuery, SearchRank
+from django.db.models import F, Q
+from rest_framework import filters
+from .ranking import order_by_relevance
+
+RELEVANCE_SORT = 'relevance'
+
+def get_search_backend():
+    """Return the configured property search backend ('fulltext' or 'icontains')"""
+    return getattr(settings, 'PROPERTY_SEARCH_BACKEND', 'icontains')
+
+def search_properties(queryset, query, backend=None, order_by_rank=True):
+    """Filter properties matching a free-text query with the given backend"""
+    backend = backend or get_search_backend()
+    
+    if backend == 'fulltext':
+        search_query = SearchQuery(query, search_type='websearch', config='english')
+        queryset = queryset.filter(searchVector=search_query).annotate(
+            search_rank=SearchRank(F('searchVector'), search_query)
+        )
+        if order_by_rank:
+            queryset = queryset.order_by('-search_rank', '-createdAt', '-id')
+        return queryset
+    
+    return queryset.filter(
+        Q(title__icontains=query) |
+        Q(description__icontains=query) |
+        Q(location__icontains=query)
+    )
+
+class PropertySearchFilter(filters.SearchFilter):
+    """SearchFilter that answers ?search= from the full-text document when enabled.
+    
+    ?sort=relevance orders searches by the blended relevance score instead of
+    text rank alone; listings without a text query keep their usual ordering.
+    """
+    
+    def filter_queryset(self, request, queryset, view):
+        search_terms = self.get_search_terms(request)
+        if get_search_backend() != 'fulltext':
+            queryset = super().filter_queryset(request, queryset, view)
+        elif search_terms:
+            # An explicit ?ordering= (e.g. by price) takes precedence over relevance
+            queryset = search_properties(
+                queryset, ' '.join(search_terms), backend='fulltext',
+                order_by_rank=not request.query_params.get('ordering'),
+            )
+        
+        searched = search_terms or request.query_params.get('q')
+        if searched and self.wants_relevance(request):
+            queryset = order_by_relevance(queryset)
+        return queryset
+    
+    def wants_relevance(self, request):
+        return (
+            request.query_params.get('sort') == RELEVANCE_SORT
+            and not request.query_params.get('ordering')
+        )
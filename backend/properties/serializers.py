@@ -3,31 +3,108 @@ from .models import Property, Favorite, PropertyView
 from django.db.models import Count, Q
 from django.utils import timezone
 from datetime import timedelta
+from .images import DETAIL_IMAGE_SIZES, LIST_IMAGE_SIZES, image_urls
 
-class PropertyListSerializer(serializers.ModelSerializer):
+def _param_set(request, name):
+    value = request.query_params.get(name, '') if request is not None else ''
+    return {field.strip() for field in value.split(',') if field.strip()}
+
+def sparse_field_names(request, available):
+    """Field names left after applying ?fields= and ?omit=; id is always kept"""
+    requested = _param_set(request, 'fields')
+    omitted = _param_set(request, 'omit')
+    return [
+        name for name in available
+        if name == 'id' or ((not requested or name in requested) and name not in omitted)
+    ]
+
+def trim_fields(data, request):
+    """Apply ?fields= / ?omit= to an already serialized representation"""
+    return {name: data[name] for name in sparse_field_names(request, data)}
+
+class SparseFieldsetMixin:
+    """Serializer that renders only the fields asked for with ?fields= / ?omit=.
+    
+    Meta.source_columns maps method fields to the model columns they read, so
+    views can load just the columns the trimmed representation needs.
+    """
+    
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        request = self.context.get('request')
+        if request is not None and hasattr(request, 'query_params'):
+            keep = set(sparse_field_names(request, self.fields))
+            for name in list(self.fields):
+                if name not in keep:
+                    self.fields.pop(name)
+    
+    def source_columns(self):
+        """Model columns (and owner__ lookups) read by the remaining fields"""
+        concrete = {field.name for field in self.Meta.model._meta.concrete_fields}
+        extra = getattr(self.Meta, 'source_columns', {})
+        columns = set()
+        for name, field in self.fields.items():
+            for source in extra.get(name, [field.source]):
+                path = source.replace('.', '__')
+                if path.split('__')[0] in concrete:
+                    columns.add(path)
+        return columns
+
+class PropertyListSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
     """Serializer for property list view - minimal data for cards"""
     amenities_count = serializers.SerializerMethodField()
+    images = serializers.SerializerMethodField()
+    is_favorited = serializers.SerializerMethodField()
     
     class Meta:
         model = Property
         fields = [
             'id', 'title', 'type', 'category', 'listingType', 
             'areaSize', 'availableFrom', 'minimumPrice', 'maximumPrice',
-            'location', 'city', 'availability', 'amenities_count'
+            'location', 'city', 'availability', 'amenities_count',
+            'viewCount', 'favoriteCount', 'images', 'is_favorited'
         ]
+        source_columns = {'amenities_count': ['amenities'], 'images': ['imageIds']}
     
     def get_amenities_count(self, obj):
         return len(obj.amenities) if obj.amenities else 0
+    
+    def get_images(self, obj):
+        # Cards only need the smallest thumbnail
+        return image_urls(obj.imageIds, LIST_IMAGE_SIZES)
+    
+    def get_is_favorited(self, obj):
+        # Set per seeker by the list views on top of the shared cached page
+        return False
 
-class PropertyDetailSerializer(serializers.ModelSerializer):
+class PropertyNearbySerializer(PropertyListSerializer):
+    """Serializer for map pins - card data plus coordinates and distance"""
+    distance_km = serializers.FloatField(read_only=True)
+    
+    class Meta(PropertyListSerializer.Meta):
+        fields = PropertyListSerializer.Meta.fields + ['latitude', 'longitude', 'distance_km']
+
+class PropertySimilarSerializer(PropertyListSerializer):
+    """Serializer for similar listings - card data plus similarity score"""
+    similarity = serializers.FloatField(read_only=True)
+    
+    class Meta(PropertyListSerializer.Meta):
+        fields = PropertyListSerializer.Meta.fields + ['similarity']
+
+class PropertyDetailSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
     """Serializer for property detail view - complete data"""
     owner_name = serializers.CharField(source='owner.name', read_only=True)
     owner_phone = serializers.CharField(source='owner.phone', read_only=True)
+    images = serializers.SerializerMethodField()
     
     class Meta:
         model = Property
-        fields = '__all__'
-        read_only_fields = ['owner', 'createdAt', 'updatedAt']
+        exclude = ['searchVector', 'priceRange']
+        read_only_fields = ['owner', 'createdAt', 'updatedAt', 'viewCount', 'favoriteCount', 'uniqueViewerCount']
+        source_columns = {'images': ['imageIds']}
+    
+    def get_images(self, obj):
+        return image_urls(obj.imageIds, DETAIL_IMAGE_SIZES)
 
 class PropertyStatusUpdateSerializer(serializers.ModelSerializer):
     """Serializer for status-only updates"""
@@ -35,6 +112,19 @@ class PropertyStatusUpdateSerializer(serializers.ModelSerializer):
         model = Property
         fields = ['availability']
 
+class PropertyBulkStatusSerializer(serializers.Serializer):
+    """Serializer for bulk availability / active status updates"""
+    MAX_IDS = 500
+    
+    ids = serializers.ListField(child=serializers.CharField(max_length=16), allow_empty=False, max_length=MAX_IDS)
+    availability = serializers.ChoiceField(choices=Property.AVAILABILITY_STATUS, required=False)
+    isActive = serializers.BooleanField(required=False)
+    
+    def validate(self, data):
+        if 'availability' not in data and 'isActive' not in data:
+            raise serializers.ValidationError("Provide availability or isActive")
+        return data
+
 class PropertyCreateUpdateSerializer(serializers.ModelSerializer):
     """Serializer for creating and updating properties"""
     furnished = serializers.CharField(write_only=True, required=False)
@@ -42,7 +132,10 @@ class PropertyCreateUpdateSerializer(serializers.ModelSerializer):
     
     class Meta:
         model = Property
-        exclude = ['owner', 'createdAt', 'updatedAt']
+        exclude = [
+            'owner', 'createdAt', 'updatedAt', 'searchVector', 'priceRange',
+            'viewCount', 'favoriteCount', 'uniqueViewerCount'
+        ]
     
     def validate_minimumPrice(self, value):
         if value < 0:
@@ -66,15 +159,28 @@ class PropertyCreateUpdateSerializer(serializers.ModelSerializer):
                 raise serializers.ValidationError("Maximum price cannot be less than minimum price")
         return data
 
+class FavoritePropertySerializer(PropertyListSerializer):
+    """Card data of a property in the seeker's favorites"""
+    
+    def get_is_favorited(self, obj):
+        return True
+
 class FavoriteSerializer(serializers.ModelSerializer):
     """Serializer for favorites with property details"""
-    property = PropertyListSerializer(read_only=True)
+    property = FavoritePropertySerializer(read_only=True)
     user_name = serializers.CharField(source='user.name', read_only=True)
     
     class Meta:
         model = Favorite
         fields = ['id', 'user', 'user_name', 'property', 'createdAt']
         read_only_fields = ['user', 'createdAt']
+    
+    def source_columns(self):
+        """Favorite, user and property card columns the representation reads"""
+        card_columns = FavoritePropertySerializer().source_columns() | {'id', 'createdAt'}
+        return {'id', 'createdAt', 'user', 'user__name', 'property'} | {
+            f'property__{column}' for column in card_columns
+        }
 
 class FavoriteCreateSerializer(serializers.ModelSerializer):
     """Serializer for creating favorites"""
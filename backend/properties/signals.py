@@ -0,0 +1,59 @@
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save, pre_save
+from django.dispatch import receiver
+from .autocomplete import LOCATION_KINDS, location_values, publish_location_changes
+from .cache import bump_listing_version, invalidate_details
+from .counters import adjust_counters, has_other_views
+from .models import Favorite, Property, PropertyView
+from .rollups import mark_stale
+
+@receiver(post_save, sender=Property)
+@receiver(post_delete, sender=Property)
+def invalidate_listing_caches(sender, instance, **kwargs):
+    # Bump after commit so concurrent readers cannot re-cache the old rows
+    transaction.on_commit(bump_listing_version)
+    transaction.on_commit(lambda: invalidate_details([instance.pk]))
+
+@receiver(pre_save, sender=Property)
+def remember_location(sender, instance, **kwargs):
+    # The autocomplete index recounts the values a listing had before the save too
+    instance._previous_location = None
+    if not instance._state.adding:
+        instance._previous_location = Property.objects.filter(pk=instance.pk).values(*LOCATION_KINDS).first()
+
+@receiver(post_save, sender=Property)
+@receiver(post_delete, sender=Property)
+def publish_location(sender, instance, **kwargs):
+    values = location_values(instance)
+    previous = getattr(instance, '_previous_location', None)
+    if previous:
+        values |= location_values(previous)
+    transaction.on_commit(lambda: publish_location_changes(values))
+
+@receiver(post_save, sender=Favorite)
+def count_favorite(sender, instance, created, **kwargs):
+    if created:
+        adjust_counters(instance.property_id, favoriteCount=1)
+        transaction.on_commit(lambda: invalidate_details([instance.property_id]))
+
+@receiver(post_delete, sender=Favorite)
+def uncount_favorite(sender, instance, **kwargs):
+    adjust_counters(instance.property_id, favoriteCount=-1)
+    transaction.on_commit(lambda: invalidate_details([instance.property_id]))
+    transaction.on_commit(lambda: mark_stale(instance.property_id, instance.createdAt))
+
+@receiver(post_save, sender=PropertyView)
+def count_view(sender, instance, created, **kwargs):
+    if not created:
+        return
+    first_visit = instance.user_id is not None and not has_other_views(
+        instance.property_id, instance.user_id, exclude_pk=instance.pk
+    )
+    adjust_counters(instance.property_id, viewCount=1, uniqueViewerCount=int(first_visit))
+
+@receiver(post_delete, sender=PropertyView)
+def uncount_view(sender, instance, **kwargs):
+    last_visit = instance.user_id is not None and not has_other_views(
+        instance.property_id, instance.user_id
+    )
+    adjust_counters(instance.property_id, viewCount=-1, uniqueViewerCount=-int(last_visit))
@@ -0,0 +1,339 @@
+import threading
+from collections import defaultdict
+from datetime import timedelta
+import numpy as np
+from django.db import transaction
+from django.db.models import Max, Min, Q
+from django.utils import timezone
+from .models import Property, SimilarProperty
+
+TOP_K = 10
+CHUNK_SIZE = 512
+FLOOR_BATCH_SIZE = 5000
+# Changed rows are re-read with this much overlap, so clock skew between
+# app servers stamping updatedAt never hides a write
+SYNC_OVERLAP = timedelta(minutes=1)
+
+# Relative importance of each feature block in the distance
+FEATURE_WEIGHTS = {
+    'category': 1.0,
+    'type': 1.0,
+    'furnishingStatus': 0.5,
+    'genderPreference': 0.5,
+    'amenities': 1.0,
+    'price': 2.0,
+    'location': 2.0,
+}
+
+CATEGORICAL_FEATURES = {
+    'category': Property.CATEGORIES,
+    'type': Property.PROPERTY_TYPES,
+    'furnishingStatus': Property.FURNISHING_STATUS,
+    'genderPreference': Property.GENDER_PREFERENCES,
+}
+
+FEATURE_COLUMNS = (
+    'id', 'listingType', 'category', 'type', 'furnishingStatus', 'genderPreference',
+    'amenities', 'minimumPrice', 'latitude', 'longitude',
+)
+
+def _amenity_set(amenities):
+    if not isinstance(amenities, list):
+        return set()
+    return {str(amenity).strip().lower() for amenity in amenities if str(amenity).strip()}
+
+def _range(values):
+    """Minimum and span of values along the first axis, zero for no values"""
+    if not len(values):
+        return np.zeros(values.shape[1:]), np.zeros(values.shape[1:])
+    return values.min(axis=0), values.max(axis=0) - values.min(axis=0)
+
+def _scale(values, low, span):
+    """Min-max scale with a fitted range; constant features scale to 0"""
+    return np.divide(values - low, span, out=np.zeros_like(values), where=span > 0)
+
+def _prices(rows):
+    # Prices are compared on a log scale
+    return np.log1p(np.array([float(row['minimumPrice'] or 0) for row in rows], dtype=np.float64))
+
+def _coordinates(rows):
+    return np.array(
+        [[np.nan if row[axis] is None else float(row[axis]) for axis in ('latitude', 'longitude')] for row in rows],
+        dtype=np.float64,
+    ).reshape(len(rows), 2)
+
+class FeatureMatrix:
+    """Feature vectors of the active listings that can be compared with each other.
+
+    The amenity vocabulary and the price and coordinate ranges are fitted on
+    the rows the matrix is built from and then frozen, so a changed listing
+    is encoded on its own with upsert. Amenities first seen after the build
+    are ignored until the next rebuild.
+    """
+
+    def __init__(self, rows):
+        self.ids = [row['id'] for row in rows]
+        self.index = {pk: i for i, pk in enumerate(self.ids)}
+        self._fit(rows)
+        self.vectors = self._encode(rows)
+        self.norms = np.einsum('ij,ij->i', self.vectors, self.vectors)
+
+    def _fit(self, rows):
+        amenity_sets = [_amenity_set(row['amenities']) for row in rows]
+        self.vocabulary = {amenity: i for i, amenity in enumerate(sorted(set().union(*amenity_sets)))}
+        self.price_range = _range(_prices(rows))
+        # Missing coordinates fall back to the centre of the known ones
+        coordinates = _coordinates(rows)
+        self.centre = np.nanmean(coordinates, axis=0) if (~np.isnan(coordinates)).any() else np.zeros(2)
+        self.coordinate_range = _range(np.where(np.isnan(coordinates), self.centre, coordinates))
+
+    def _encode(self, rows):
+        blocks = []
+        for field, choices in CATEGORICAL_FEATURES.items():
+            positions = {value: i for i, (value, _) in enumerate(choices)}
+            block = np.zeros((len(rows), len(choices)), dtype=np.float32)
+            for i, row in enumerate(rows):
+                if row[field] in positions:
+                    block[i, positions[row[field]]] = 1.0
+            blocks.append(block * FEATURE_WEIGHTS[field])
+
+        # Multi-hot amenities, scaled to unit length so long lists do not dominate
+        amenities = np.zeros((len(rows), len(self.vocabulary)), dtype=np.float32)
+        for i, row in enumerate(rows):
+            for amenity in _amenity_set(row['amenities']):
+                if amenity in self.vocabulary:
+                    amenities[i, self.vocabulary[amenity]] = 1.0
+        lengths = np.linalg.norm(amenities, axis=1, keepdims=True)
+        blocks.append(np.divide(amenities, lengths, out=amenities, where=lengths > 0) * FEATURE_WEIGHTS['amenities'])
+
+        prices = _scale(_prices(rows), *self.price_range)
+        blocks.append((prices * FEATURE_WEIGHTS['price'])[:, None].astype(np.float32))
+
+        coordinates = _coordinates(rows)
+        coordinates = np.where(np.isnan(coordinates), self.centre, coordinates)
+        blocks.append((_scale(coordinates, *self.coordinate_range) * FEATURE_WEIGHTS['location']).astype(np.float32))
+
+        return np.hstack(blocks)
+
+    def upsert(self, row):
+        """Encode one listing into the matrix; returns whether its vector changed"""
+        vector = self._encode([row])[0]
+        position = self.index.get(row['id'])
+        if position is None:
+            self.index[row['id']] = len(self.ids)
+            self.ids.append(row['id'])
+            self.vectors = np.vstack([self.vectors, vector])
+            self.norms = np.append(self.norms, vector @ vector)
+            return True
+        if np.array_equal(self.vectors[position], vector):
+            return False
+        self.vectors[position] = vector
+        self.norms[position] = vector @ vector
+        return True
+
+    def remove(self, pk):
+        """Drop a listing, moving the last row into its place; returns whether it was present"""
+        position = self.index.pop(pk, None)
+        if position is None:
+            return False
+        last = len(self.ids) - 1
+        if position != last:
+            self.ids[position] = self.ids[last]
+            self.index[self.ids[position]] = position
+            self.vectors[position] = self.vectors[last]
+            self.norms[position] = self.norms[last]
+        self.ids.pop()
+        self.vectors = self.vectors[:last]
+        self.norms = self.norms[:last]
+        return True
+
+    def neighbours(self, positions, k=TOP_K):
+        """Yield (position, [(neighbour position, score), ...]) best first, excluding itself"""
+        k = min(k, len(self.ids) - 1)
+        if k <= 0:
+            for position in positions:
+                yield position, []
+            return
+
+        positions = np.asarray(list(positions), dtype=np.int64)
+        for start in range(0, len(positions), CHUNK_SIZE):
+            chunk = positions[start:start + CHUNK_SIZE]
+            # Squared euclidean distances via |a|^2 + |b|^2 - 2ab, one matrix product per chunk
+            distances = self.norms[chunk, None] + self.norms[None, :] - 2 * (self.vectors[chunk] @ self.vectors.T)
+            distances[np.arange(len(chunk)), chunk] = np.inf
+            nearest = np.argpartition(distances, k - 1, axis=1)[:, :k]
+            nearest_distances = np.take_along_axis(distances, nearest, axis=1)
+            order = np.argsort(nearest_distances, axis=1)
+            nearest = np.take_along_axis(nearest, order, axis=1)
+            scores = 1.0 / (1.0 + np.sqrt(np.maximum(np.take_along_axis(nearest_distances, order, axis=1), 0)))
+            for row, position in enumerate(chunk):
+                yield int(position), list(zip(nearest[row].tolist(), scores[row].tolist()))
+
+    def scores_against(self, position):
+        """Similarity score of every listing to the listing at position"""
+        distances = self.norms + self.norms[position] - 2 * (self.vectors @ self.vectors[position])
+        return 1.0 / (1.0 + np.sqrt(np.maximum(distances, 0)))
+
+def build_matrices():
+    """One feature matrix per listing type; rent and sale listings are never compared"""
+    groups = defaultdict(list)
+    for row in Property.objects.filter(isActive=True).order_by().values(*FEATURE_COLUMNS).iterator(chunk_size=5000):
+        groups[row['listingType']].append(row)
+    return {listing_type: FeatureMatrix(rows) for listing_type, rows in groups.items()}
+
+class SimilarityIndex:
+    """Feature matrices built once and then kept in step row by row.
+
+    sync re-reads only the listings whose updatedAt moved since the last sync
+    and re-encodes them against the frozen encoders. The matrices are rebuilt
+    when the active listing count no longer matches, e.g. after a listing
+    was deleted outright. Meant for one long-running process
+    (compute_similar_properties --follow), not for request workers.
+    """
+
+    def __init__(self):
+        self.matrices = None
+        self.synced_at = None
+        self.lock = threading.RLock()
+
+    def _size(self):
+        return sum(len(matrix.ids) for matrix in self.matrices.values())
+
+    def rebuild(self):
+        with self.lock:
+            started = timezone.now()
+            self.matrices = build_matrices()
+            self.synced_at = started
+
+    def sync(self):
+        """Apply the listings changed since the last sync; returns their ids, or None after the first build"""
+        with self.lock:
+            if self.matrices is None:
+                self.rebuild()
+                return None
+
+            started = timezone.now()
+            rows = Property.objects.filter(updatedAt__gte=self.synced_at - SYNC_OVERLAP).values(*FEATURE_COLUMNS, 'isActive')
+            changed = set()
+            for row in rows:
+                pk = row['id']
+                current = next((t for t, matrix in self.matrices.items() if pk in matrix.index), None)
+                if current is not None and (not row['isActive'] or current != row['listingType']):
+                    self.matrices[current].remove(pk)
+                    changed.add(pk)
+                if row['isActive']:
+                    matrix = self.matrices.get(row['listingType'])
+                    if matrix is None:
+                        self.matrices[row['listingType']] = FeatureMatrix([row])
+                        changed.add(pk)
+                    elif matrix.upsert(row):
+                        changed.add(pk)
+            self.synced_at = started
+
+            if Property.objects.filter(isActive=True).count() != self._size():
+                self.rebuild()
+            return changed
+
+def _similar_rows(matrix, positions, k, computed_at):
+    for position, neighbours in matrix.neighbours(positions, k):
+        for rank, (neighbour, score) in enumerate(neighbours, start=1):
+            yield SimilarProperty(
+                property_id=matrix.ids[position],
+                similar_id=matrix.ids[neighbour],
+                score=score,
+                rank=rank,
+                computedAt=computed_at,
+            )
+
+def _write(rows, batch_size=5000):
+    batch = []
+    for row in rows:
+        batch.append(row)
+        if len(batch) >= batch_size:
+            SimilarProperty.objects.bulk_create(batch)
+            batch = []
+    if batch:
+        SimilarProperty.objects.bulk_create(batch)
+
+def rebuild_similar_properties(k=TOP_K):
+    """Recompute the neighbours of every active listing"""
+    computed_at = timezone.now()
+    matrices = build_matrices()
+    with transaction.atomic():
+        SimilarProperty.objects.all().delete()
+        for matrix in matrices.values():
+            _write(_similar_rows(matrix, range(len(matrix.ids)), k, computed_at))
+    return sum(len(matrix.ids) for matrix in matrices.values())
+
+def last_computed_at():
+    """When the neighbour table was last written, the watermark for incremental runs"""
+    return SimilarProperty.objects.aggregate(latest=Max('computedAt'))['latest']
+
+def _beaten_floors(matrices, changed, k):
+    """Listings for which a changed listing now scores above their stored k-th neighbour.
+
+    Only listings a changed one beats the lowest stored k-th score for can
+    qualify, so the k-th rows are read for those candidates alone.
+    """
+    lowest = SimilarProperty.objects.filter(rank=k).aggregate(lowest=Min('score'))['lowest']
+    for matrix in matrices.values():
+        positions = [matrix.index[pk] for pk in changed if pk in matrix.index]
+        limit = min(k, len(matrix.ids) - 1)
+        if not positions or limit <= 0:
+            continue
+
+        best = np.full(len(matrix.ids), -np.inf)
+        for position in positions:
+            np.maximum(best, matrix.scores_against(position), out=best)
+        # Changed listings are recomputed anyway
+        best[positions] = -np.inf
+        if lowest is None or len(matrix.ids) - len(positions) <= k:
+            # A matrix that just grew past k has no k-th rows yet
+            candidates = np.flatnonzero(best > -np.inf)
+        else:
+            candidates = np.flatnonzero(best > lowest)
+
+        ids = [matrix.ids[position] for position in candidates.tolist()]
+        floors = {}
+        for start in range(0, len(ids), FLOOR_BATCH_SIZE):
+            floors.update(
+                SimilarProperty.objects.filter(rank=limit, property_id__in=ids[start:start + FLOOR_BATCH_SIZE])
+                .values_list('property_id', 'score')
+            )
+        for position, pk in zip(candidates.tolist(), ids):
+            # Neighbours are stored best first, so the row at rank limit holds
+            # the k-th score; listings without one have fewer than they should
+            if pk not in floors or best[position] > floors[pk]:
+                yield pk
+
+def update_similar_properties(property_ids, k=TOP_K, index=None):
+    """Refresh neighbours after the given listings changed, touching only affected rows.
+
+    Affected listings are the changed ones (with those the index picked up
+    since its last sync), listings whose stored neighbours include a changed
+    or deleted one, and listings for which a changed one now scores above
+    their current k-th neighbour. Pass a long-lived index to skip building
+    the matrices on each call.
+    """
+    computed_at = timezone.now()
+    index = index or SimilarityIndex()
+    with index.lock:
+        changed = set(property_ids) | (index.sync() or set())
+        affected = set(changed)
+        affected.update(
+            SimilarProperty.objects.filter(Q(similar_id__in=changed) | Q(similar__isnull=True))
+            .values_list('property_id', flat=True)
+        )
+        if changed:
+            affected.update(_beaten_floors(index.matrices, changed, k))
+        if affected:
+            _rewrite(index.matrices, affected, k, computed_at)
+    return affected
+
+def _rewrite(matrices, property_ids, k, computed_at):
+    with transaction.atomic():
+        SimilarProperty.objects.filter(property_id__in=property_ids).delete()
+        for matrix in matrices.values():
+            positions = [matrix.index[pk] for pk in property_ids if pk in matrix.index]
+            if positions:
+                _write(_similar_rows(matrix, positions, k, computed_at))
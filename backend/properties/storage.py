@@ -0,0 +1,57 @@
+import mimetypes
+from urllib.parse import quote
+from django.conf import settings
+from django.core.files.storage import Storage
+from django.utils.deconstruct import deconstructible
+from django.utils.functional import cached_property
+
+@deconstructible
+class GoogleCloudStorage(Storage):
+    """Django storage backend writing to a Google Cloud Storage bucket.
+
+    Objects are served from their public URL. Names are expected to be content
+    addressed, so an existing object is overwritten rather than renamed and
+    clients may cache it forever.
+    """
+
+    def __init__(self, bucket_name=None, project_id=None, credentials_path=None,
+                 cache_control='public, max-age=31536000, immutable'):
+        self.bucket_name = bucket_name or settings.GCS_BUCKET_NAME
+        self.project_id = project_id or settings.GCS_PROJECT_ID
+        self.credentials_path = credentials_path or settings.GCS_SERVICE_ACCOUNT_KEY_PATH
+        self.cache_control = cache_control
+
+    @cached_property
+    def bucket(self):
+        # Imported lazily so the filesystem backend works without the GCS client
+        from google.cloud import storage
+
+        client = storage.Client.from_service_account_json(str(self.credentials_path), project=self.project_id)
+        return client.bucket(self.bucket_name)
+
+    def _save(self, name, content):
+        blob = self.bucket.blob(name)
+        blob.cache_control = self.cache_control
+        content_type = getattr(content, 'content_type', None) or mimetypes.guess_type(name)[0]
+        content.seek(0)
+        blob.upload_from_file(content, content_type=content_type)
+        return name
+
+    def _open(self, name, mode='rb'):
+        return self.bucket.blob(name).open(mode)
+
+    def get_available_name(self, name, max_length=None):
+        return name
+
+    def exists(self, name):
+        return self.bucket.blob(name).exists()
+
+    def delete(self, name):
+        self.bucket.blob(name).delete()
+
+    def size(self, name):
+        blob = self.bucket.get_blob(name)
+        return blob.size if blob else 0
+
+    def url(self, name):
+        return f'https://storage.googleapis.com/{self.bucket_name}/{quote(name)}'
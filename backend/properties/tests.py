@@ -1,3 +1,622 @@
-from django.test import TestCase
+import io
+import random
+import unittest
+from datetime import timedelta
+from decimal import Decimal
+from unittest import mock
 
-# Create your tests here.
+from django.contrib.auth.models import AnonymousUser
+from django.core.cache import cache
+from django.db import connection
+from django.test import RequestFactory, SimpleTestCase, TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from accounts.models import CustomUser
+from . import autocomplete, tracking
+from .counters import adjust_counters
+from .imports import import_properties, read_rows
+from .models import Favorite, Property, PropertyView, ProviderViewer, SimilarProperty
+from .rollups import roll_up, unique_viewers
+from .similarity import SimilarityIndex, rebuild_similar_properties, update_similar_properties
+
+SEEDED_PROPERTIES = 20000
+
+CITIES = ['Bangalore', 'Mumbai', 'Pune', 'Delhi', 'Hyderabad', 'Chennai', 'Kolkata', 'Jaipur']
+
+LOCALITIES = [
+    'Koramangala', 'Indiranagar', 'Whitefield', 'Andheri', 'Bandra', 'Powai', 'Kothrud', 'Hinjewadi',
+    'Saket', 'Dwarka', 'Gachibowli', 'Madhapur', 'Adyar', 'Velachery', 'Ballygunge', 'Malviya',
+    'Navrangpura', 'Gomti', 'Kakkanad', 'Aundh', 'Baner', 'Wakad', 'Vashi', 'Juhu', 'Colaba',
+    'Jayanagar', 'Hebbal', 'Yelahanka', 'Kondapur', 'Banjara', 'Mylapore', 'Tambaram', 'Howrah',
+    'Bidhannagar', 'Vaishali', 'Mansarovar', 'Sodala', 'Rohini', 'Pitampura', 'Janakpuri',
+]
+
+AMENITIES = ['metro', 'parking', 'gym', 'pool', 'lift', 'terrace', 'garden', 'security', 'backup', 'balcony']
+
+@unittest.skipUnless(connection.vendor == 'postgresql', 'Query plans are Postgres specific')
+class PropertyQueryPlanTests(TestCase):
+    """EXPLAIN the queries each property endpoint runs and fail on sequential scans"""
+
+    @classmethod
+    def setUpTestData(cls):
+        rng = random.Random(513)
+        cls.providers = [
+            CustomUser.objects.create_user(email=f'provider{i}@example.com', name=f'Provider {i}', role='provider')
+            for i in range(50)
+        ]
+        cls.seeker = CustomUser.objects.create_user(email='seeker@example.com', name='Seeker', role='seeker')
+
+        properties = []
+        for i in range(SEEDED_PROPERTIES):
+            city = rng.choice(CITIES)
+            locality = rng.choice(LOCALITIES)
+            amenities = rng.sample(AMENITIES, 3)
+            price = Decimal(rng.randrange(3000, 150000, 500))
+            properties.append(Property(
+                type=rng.choice(Property.PROPERTY_TYPES)[0],
+                category=rng.choice(Property.CATEGORIES)[0],
+                listingType=rng.choice(Property.LISTING_TYPES)[0],
+                availability=rng.choice(Property.AVAILABILITY_STATUS)[0],
+                title=f'Listing {i} in {locality}',
+                description=f"Spacious home with {' and '.join(amenities)}",
+                minimumPrice=price,
+                maximumPrice=price + 5000,
+                location=f'{locality}, {city}',
+                amenities=amenities if rng.random() > 0.7 else [],
+                city=city,
+                state='State',
+                latitude=Decimal(rng.uniform(8, 30)).quantize(Decimal('0.000001')),
+                longitude=Decimal(rng.uniform(70, 90)).quantize(Decimal('0.000001')),
+                owner=rng.choice(cls.providers),
+                isActive=rng.random() > 0.1,
+            ))
+        Property.objects.bulk_create(properties, batch_size=2000)
+        cls.property = properties[0]
+
+        # Flush GIN pending lists and refresh statistics, as autovacuum would on the live table
+        with connection.cursor() as cursor:
+            cursor.execute("""
+                SELECT gin_clean_pending_list(i.indexrelid)
+                FROM pg_index i
+                JOIN pg_class c ON c.oid = i.indexrelid
+                JOIN pg_am a ON a.oid = c.relam
+                WHERE i.indrelid = 'properties_property'::regclass AND a.amname = 'gin'
+            """)
+            cursor.execute('ANALYZE properties_property')
+
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+
+    def _seq_scans(self, plan):
+        if plan.get('Node Type') == 'Seq Scan' and plan.get('Relation Name') == 'properties_property':
+            yield plan
+        for child in plan.get('Plans', []):
+            yield from self._seq_scans(child)
+
+    def assertNoSeqScan(self, user, url):
+        self.client.force_authenticate(user)
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(url)
+        self.assertEqual(response.status_code, 200, response.content)
+
+        for query in queries.captured_queries:
+            sql = query['sql']
+            if not sql.startswith('SELECT') or 'properties_property' not in sql:
+                continue
+            with connection.cursor() as cursor:
+                cursor.execute('EXPLAIN (FORMAT JSON) ' + sql)
+                plan = cursor.fetchone()[0]
+            self.assertFalse(
+                list(self._seq_scans(plan[0]['Plan'])),
+                f'{url} falls back to a sequential scan:\n{sql}'
+            )
+
+    def test_seeker_endpoints_use_indexes(self):
+        urls = [
+            '/api/properties/',
+            '/api/properties/?category=pg',
+            '/api/properties/?listingType=rent',
+            '/api/properties/?type=1BHK',
+            '/api/properties/?availability=Occupied',
+            '/api/properties/?city=Pune',
+            '/api/properties/?min_price=10000&max_price=12000',
+            '/api/properties/?min_price=10000&max_price=12000&price_mode=overlap',
+            '/api/properties/?ordering=price',
+            '/api/properties/?amenities=gym,pool',
+            '/api/properties/?amenities=gym,pool&amenities_match=any',
+            '/api/properties/search/?q=Koramangala',
+            '/api/properties/search/?search=Whitefield',
+            '/api/properties/nearby/?lat=12.97&lng=77.59&radius=10',
+            f'/api/properties/{self.property.id}/',
+        ]
+        for url in urls:
+            with self.subTest(url=url):
+                self.assertNoSeqScan(self.seeker, url)
+
+    def test_provider_endpoints_use_indexes(self):
+        provider = self.providers[0]
+        urls = [
+            '/api/properties/',
+            '/api/properties/?category=room',
+            '/api/properties/search/?availability=Available',
+        ]
+        for url in urls:
+            with self.subTest(url=url):
+                self.assertNoSeqScan(provider, url)
+
+class FavoriteListQueryTests(TestCase):
+    """The favorites endpoint runs a fixed number of queries however many favorites a seeker has"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.provider = CustomUser.objects.create_user(email='owner@example.com', name='Owner', role='provider')
+        cls.seeker = CustomUser.objects.create_user(email='fan@example.com', name='Fan', role='seeker')
+        cls.properties = Property.objects.bulk_create([
+            Property(
+                type='1BHK',
+                category='apartment',
+                listingType='rent',
+                title=f'Listing {i}',
+                description='Bright flat',
+                minimumPrice=Decimal(10000 + i),
+                location='Indiranagar, Bangalore',
+                city='Bangalore',
+                state='Karnataka',
+                amenities=['gym'],
+                owner=cls.provider,
+            )
+            for i in range(30)
+        ])
+
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(self.seeker)
+
+    def favorite(self, properties):
+        for prop in properties:
+            Favorite.objects.create(user=self.seeker, property=prop)
+
+    def list_favorites(self):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get('/api/properties/favorites/?page_size=50')
+        self.assertEqual(response.status_code, 200, response.content)
+        return response.data['results'], len(queries)
+
+    def test_query_count_does_not_grow_with_favorites(self):
+        self.favorite(self.properties[:2])
+        results, baseline = self.list_favorites()
+        self.assertEqual(len(results), 2)
+
+        self.favorite(self.properties[2:])
+        with self.assertNumQueries(baseline):
+            response = self.client.get('/api/properties/favorites/?page_size=50')
+        self.assertEqual(len(response.data['results']), 30)
+        self.assertTrue(all(result['property']['is_favorited'] for result in response.data['results']))
+        self.assertEqual(response.data['results'][0]['user_name'], 'Fan')
+
+    def test_pages_follow_cursor_without_inactive_properties(self):
+        self.favorite(self.properties)
+        Property.objects.filter(pk=self.properties[29].pk).update(isActive=False)
+
+        seen = []
+        url = '/api/properties/favorites/?page_size=10'
+        while url:
+            response = self.client.get(url)
+            self.assertEqual(response.status_code, 200, response.content)
+            seen.extend(result['property']['id'] for result in response.data['results'])
+            url = response.data['next']
+        # Newest favorite first, each exactly once, skipping the deactivated listing
+        self.assertEqual(seen, [prop.id for prop in reversed(self.properties[:29])])
+
+class LocationIndexTests(SimpleTestCase):
+    """Count changes keep the prefix index and its memoized top lists exact"""
+
+    def setUp(self):
+        cache.clear()
+        self.index = autocomplete.LocationIndex()
+        for value, total in [('Bangalore', 5), ('Bandra', 3), ('Baner', 1), ('Pune', 4)]:
+            self.index.set_count('city', value, total)
+
+    def values(self, prefix):
+        return [(match['value'], match['count']) for match in self.index.search(prefix)]
+
+    def test_search_ranks_matches_by_count(self):
+        self.assertEqual(self.values('ban'), [('Bangalore', 5), ('Bandra', 3), ('Baner', 1)])
+        self.assertEqual(self.values('pu'), [('Pune', 4)])
+        self.assertEqual(self.values('x'), [])
+
+    @mock.patch.object(autocomplete, 'HEAVY_RANGE', 1)
+    def test_memoized_prefixes_follow_count_changes(self):
+        self.assertEqual(self.values('ba')[0], ('Bangalore', 5))
+        self.assertIn('ba', self.index.memo)
+
+        self.index.set_count('city', 'Baner', 9)
+        self.assertEqual(self.values('ba'), [('Baner', 9), ('Bangalore', 5), ('Bandra', 3)])
+
+        self.index.set_count('city', 'Baner', 0)
+        self.assertEqual(self.values('ba'), [('Bangalore', 5), ('Bandra', 3)])
+        self.assertEqual(self.values('baner'), [])
+
+        self.index.set_count('city', 'Bandstand', 2)
+        self.assertEqual(self.values('band'), [('Bandra', 3), ('Bandstand', 2)])
+
+    def test_sync_recounts_published_values(self):
+        self.index.sequence = cache.get(autocomplete.SEQUENCE_KEY) or 0
+        autocomplete.publish_location_changes({('city', 'Pune'), ('state', 'Maharashtra')})
+
+        with mock.patch.object(self.index, 'recount') as recount:
+            self.index.sync()
+        recount.assert_called_once_with({('city', 'Pune'), ('state', 'Maharashtra')})
+        self.assertEqual(self.index.sequence, cache.get(autocomplete.SEQUENCE_KEY))
+
+@override_settings(PROPERTY_VIEW_BUFFER={
+    'MAX_EVENTS': 3, 'FLUSH_INTERVAL': 5, 'MAX_PENDING': 4, 'DEDUPE_WINDOW': 60, 'BACKGROUND': False,
+})
+class ViewBufferTests(SimpleTestCase):
+    """Views are filtered and deduplicated per request, then written in batches"""
+
+    def setUp(self):
+        cache.clear()
+        self.buffer = tracking.ViewBuffer()
+        self.write_views = mock.patch.object(tracking, 'write_views', side_effect=len).start()
+        mock.patch.object(tracking, 'view_buffer', self.buffer).start()
+        self.addCleanup(mock.patch.stopall)
+
+    def request(self, user=None, user_agent='Mozilla/5.0', ip='203.0.113.7'):
+        request = RequestFactory().get('/', HTTP_USER_AGENT=user_agent, REMOTE_ADDR=ip)
+        request.user = user or AnonymousUser()
+        return request
+
+    def test_repeat_views_are_counted_once(self):
+        self.assertTrue(tracking.record_view(self.request(), 'P1'))
+        self.assertFalse(tracking.record_view(self.request(), 'P1'))
+        self.assertTrue(tracking.record_view(self.request(ip='203.0.113.8'), 'P1'))
+        self.assertTrue(tracking.record_view(self.request(), 'P2'))
+
+        self.write_views.assert_called_once()
+        self.assertEqual([event.property_id for event in self.write_views.call_args.args[0]], ['P1', 'P1', 'P2'])
+
+    def test_bots_and_owners_are_not_counted(self):
+        owner = CustomUser(id='OWNER', role='provider')
+        self.assertFalse(tracking.record_view(self.request(user_agent='Googlebot/2.1'), 'P1'))
+        self.assertFalse(tracking.record_view(self.request(user=owner), 'P1', owner_id='OWNER'))
+        self.assertEqual(self.buffer.events, [])
+
+    def test_flushes_once_max_events_are_waiting(self):
+        for number in range(2):
+            self.buffer.add(tracking.ViewEvent(f'P{number}', None, None, ''))
+        self.write_views.assert_not_called()
+
+        self.buffer.add(tracking.ViewEvent('P2', None, None, ''))
+        self.write_views.assert_called_once()
+        self.assertEqual(len(self.write_views.call_args.args[0]), 3)
+        self.assertEqual(self.buffer.events, [])
+
+    def test_failed_flush_keeps_views_up_to_max_pending(self):
+        self.write_views.side_effect = RuntimeError('database unavailable')
+        for number in range(5):
+            self.buffer.add(tracking.ViewEvent(f'P{number}', None, None, ''))
+
+        self.assertEqual([event.property_id for event in self.buffer.events], ['P0', 'P1', 'P2', 'P3'])
+        self.assertEqual(self.buffer.dropped, 1)
+
+class PropertyImportTests(SimpleTestCase):
+    """Invalid rows are reported with their line and do not stop the import"""
+
+    HEADER = 'type,category,listingType,title,description,minimumPrice,location,city,state,amenities\n'
+    VALID = '1BHK,apartment,rent,Bright flat,Near the metro,12000,Indiranagar,Bangalore,Karnataka,"gym,lift"\n'
+
+    def run_import(self, rows):
+        errors = {}
+        result = import_properties(
+            rows, CustomUser(id='OWNER', role='provider'), batch_size=2, dry_run=True,
+            on_error=lambda line, detail: errors.setdefault(line, detail),
+        )
+        return result, errors
+
+    def test_csv_rows_fail_individually(self):
+        text = self.HEADER + self.VALID + '1BHK,castle,rent,Odd,Odd,12000,X,Y,Z,\n' + self.VALID + ',,,,,,,,,\n'
+        result, errors = self.run_import(read_rows(io.StringIO(text), 'csv'))
+
+        self.assertEqual(result, {'created': 2, 'failed': 2})
+        self.assertEqual(sorted(errors), [3, 5])
+        self.assertIn('category', errors[3])
+        self.assertIn('title', errors[5])
+
+    def test_unparseable_json_lines_are_reported(self):
+        text = '\n'.join([
+            '{"type": "1BHK", "category": "apartment", "listingType": "rent", "title": "Flat", '
+            '"description": "Quiet", "minimumPrice": "9000", "location": "Baner", "city": "Pune", "state": "MH"}',
+            '{not json',
+            '["a", "list"]',
+        ])
+        result, errors = self.run_import(read_rows(io.StringIO(text), 'jsonl'))
+
+        self.assertEqual(result, {'created': 1, 'failed': 2})
+        self.assertEqual(sorted(errors), [2, 3])
+        self.assertEqual(errors[2], {'non_field_errors': ['Row is not a valid JSON object']})
+
+class SimilarPropertyUpdateTests(TestCase):
+    """Incremental neighbour updates leave the table exactly as a full rebuild would"""
+
+    @classmethod
+    def setUpTestData(cls):
+        rng = random.Random(16)
+        cls.provider = CustomUser.objects.create_user(email='agency@example.com', name='Agency', role='provider')
+        cls.properties = []
+        for i in range(40):
+            # The first two listings pin the price and coordinate ranges, so
+            # the edits below never move the encoders
+            price = {0: 2000, 1: 200000}.get(i, rng.randrange(5000, 150000))
+            corner = {0: (8, 70), 1: (30, 90)}.get(i, (rng.uniform(10, 28), rng.uniform(72, 88)))
+            cls.properties.append(Property.objects.create(
+                type=rng.choice(Property.PROPERTY_TYPES)[0],
+                category=rng.choice(Property.CATEGORIES)[0],
+                listingType='rent' if i % 4 else 'sale',
+                title=f'Listing {i}',
+                description='Airy home',
+                minimumPrice=Decimal(price),
+                location='Baner, Pune',
+                city='Pune',
+                state='Maharashtra',
+                amenities=rng.sample(AMENITIES, 3),
+                latitude=Decimal(corner[0]).quantize(Decimal('0.000001')),
+                longitude=Decimal(corner[1]).quantize(Decimal('0.000001')),
+                owner=cls.provider,
+            ))
+
+    def setUp(self):
+        rebuild_similar_properties()
+
+    def neighbours(self):
+        return sorted(
+            (pk, similar, rank, round(score, 5))
+            for pk, similar, rank, score in SimilarProperty.objects.values_list('property_id', 'similar_id', 'rank', 'score')
+        )
+
+    def assertMatchesRebuild(self):
+        incremental = self.neighbours()
+        rebuild_similar_properties()
+        self.assertEqual(incremental, self.neighbours())
+
+    def edit(self, prop):
+        prop.category = 'pg' if prop.category != 'pg' else 'room'
+        prop.amenities = ['gym', 'pool', 'metro']
+        prop.minimumPrice = Decimal(60000)
+        prop.latitude, prop.longitude = Decimal('19.5'), Decimal('80.25')
+        prop.save()
+
+    def test_changed_listing(self):
+        self.edit(self.properties[5])
+        affected = update_similar_properties([self.properties[5].pk])
+        self.assertIn(self.properties[5].pk, affected)
+        self.assertLess(len(affected), len(self.properties))
+        self.assertMatchesRebuild()
+
+    def test_new_and_deactivated_listings(self):
+        self.properties[6].isActive = False
+        self.properties[6].save()
+        added = Property.objects.create(
+            type='2BHK', category='apartment', listingType='rent', title='New', description='New',
+            minimumPrice=Decimal(45000), location='Aundh, Pune', city='Pune', state='Maharashtra',
+            amenities=['gym', 'lift'], latitude=Decimal('18.5'), longitude=Decimal('73.8'), owner=self.provider,
+        )
+        update_similar_properties([self.properties[6].pk, added.pk])
+        self.assertMatchesRebuild()
+
+    def test_deleted_listing(self):
+        self.properties[7].delete()
+        self.assertTrue(SimilarProperty.objects.filter(similar__isnull=True).exists())
+        update_similar_properties([])
+        self.assertFalse(SimilarProperty.objects.filter(similar__isnull=True).exists())
+        self.assertMatchesRebuild()
+
+    def test_long_lived_index_picks_up_saves(self):
+        index = SimilarityIndex()
+        index.sync()
+        self.edit(self.properties[9])
+        affected = update_similar_properties([], index=index)
+        self.assertIn(self.properties[9].pk, affected)
+        self.assertMatchesRebuild()
+
+class CounterSaveTests(TestCase):
+    """Saving a loaded listing keeps the counter increments committed since it was loaded"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.provider = CustomUser.objects.create_user(email='host@example.com', name='Host', role='provider')
+        cls.seeker = CustomUser.objects.create_user(email='guest@example.com', name='Guest', role='seeker')
+        cls.property = Property.objects.create(
+            type='1BHK', category='apartment', listingType='rent', title='Loft', description='Loft',
+            minimumPrice=Decimal(15000), location='Baner, Pune', city='Pune', state='Maharashtra',
+            owner=cls.provider,
+        )
+
+    def test_edit_and_soft_delete_keep_counters(self):
+        loaded = Property.objects.get(pk=self.property.pk)
+        Favorite.objects.create(user=self.seeker, property=self.property)
+        adjust_counters(self.property.pk, viewCount=2, uniqueViewerCount=1)
+
+        loaded.title = 'Sunny loft'
+        loaded.save()
+        loaded.isActive = False
+        loaded.save()
+
+        saved = Property.objects.values('title', 'isActive', 'viewCount', 'favoriteCount', 'uniqueViewerCount').get(pk=self.property.pk)
+        self.assertEqual(saved, {
+            'title': 'Sunny loft', 'isActive': False, 'viewCount': 2, 'favoriteCount': 1, 'uniqueViewerCount': 1,
+        })
+
+    def test_deferred_instances_save_only_loaded_columns(self):
+        loaded = Property.objects.only('id', 'title').get(pk=self.property.pk)
+        adjust_counters(self.property.pk, viewCount=1)
+        loaded.title = 'Quiet loft'
+        with CaptureQueriesContext(connection) as queries:
+            loaded.save()
+        update = next(query['sql'] for query in queries.captured_queries if query['sql'].startswith('UPDATE'))
+        self.assertNotIn('"description"', update)
+        self.assertEqual(Property.objects.get(pk=self.property.pk).viewCount, 1)
+
+@override_settings(CACHES={'default': {
+    'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+    # Nothing listens here, so every cache call fails to connect
+    'LOCATION': 'redis://127.0.0.1:9/0',
+}})
+class CacheOutageTests(TestCase):
+    """An unreachable cache turns into misses; reads and writes still succeed against Postgres"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.provider = CustomUser.objects.create_user(email='lister@example.com', name='Lister', role='provider')
+        cls.seeker = CustomUser.objects.create_user(email='browser@example.com', name='Browser', role='seeker')
+        cls.property = Property.objects.create(
+            type='2BHK', category='apartment', listingType='rent', title='Garden flat', description='Garden flat',
+            minimumPrice=Decimal(22000), location='Aundh, Pune', city='Pune', state='Maharashtra',
+            owner=cls.provider,
+        )
+
+    def setUp(self):
+        self.client = APIClient()
+
+    def test_reads_fall_back_to_the_database(self):
+        self.client.force_authenticate(self.seeker)
+        for url in [
+            '/api/properties/',
+            '/api/properties/search/?category=apartment',
+            '/api/properties/filters/?facets=true',
+            f'/api/properties/{self.property.id}/',
+            f'/api/properties/batch/?ids={self.property.id}',
+            '/api/properties/autocomplete/?q=pu',
+        ]:
+            with self.subTest(url=url), self.assertLogs('properties', level='WARNING'):
+                response = self.client.get(url)
+                self.assertEqual(response.status_code, 200, response.content)
+
+    def test_writes_succeed_without_invalidation(self):
+        self.client.force_authenticate(self.provider)
+        # Invalidation runs in on_commit callbacks, inline as in autocommit views
+        with self.assertLogs('properties.cache', level='WARNING'), self.captureOnCommitCallbacks(execute=True):
+            response = self.client.patch(
+                f'/api/properties/{self.property.id}/update/', {'title': 'Shady flat'}, format='json'
+            )
+            self.assertEqual(response.status_code, 200, response.content)
+            self.assertEqual(Property.objects.get(pk=self.property.pk).title, 'Shady flat')
+
+            response = self.client.delete(f'/api/properties/{self.property.id}/delete/')
+            self.assertEqual(response.status_code, 204)
+        self.assertFalse(Property.objects.get(pk=self.property.pk).isActive)
+
+class PropertyBatchTests(TestCase):
+    """Batch results read counters live, like the detail endpoint, even when served from the detail cache"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.provider = CustomUser.objects.create_user(email='realtor@example.com', name='Realtor', role='provider')
+        cls.seeker = CustomUser.objects.create_user(email='renter@example.com', name='Renter', role='seeker')
+        cls.property = Property.objects.create(
+            type='1RK', category='room', listingType='rent', title='Studio', description='Studio',
+            minimumPrice=Decimal(9000), location='Wakad, Pune', city='Pune', state='Maharashtra',
+            owner=cls.provider,
+        )
+
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.client.force_authenticate(self.seeker)
+
+    def test_cached_details_carry_current_counters(self):
+        url = f'/api/properties/batch/?ids={self.property.id},missing'
+        self.assertEqual(self.client.get(url).data['results'][0]['viewCount'], 0)
+
+        adjust_counters(self.property.pk, viewCount=3, uniqueViewerCount=2)
+        Favorite.objects.create(user=self.seeker, property=self.property)
+        response = self.client.get(url)
+        result = response.data['results'][0]
+        self.assertEqual(
+            (result['viewCount'], result['uniqueViewerCount'], result['favoriteCount']), (3, 2, 1)
+        )
+        self.assertEqual(response.data['missing'], ['missing'])
+
+        detail = self.client.get(f'/api/properties/{self.property.id}/').data
+        self.assertEqual(
+            {field: detail[field] for field in ('viewCount', 'uniqueViewerCount', 'favoriteCount')},
+            {field: result[field] for field in ('viewCount', 'uniqueViewerCount', 'favoriteCount')},
+        )
+
+class UniqueViewerRollupTests(TestCase):
+    """Lifetime unique viewers combine the per-provider rollup with the views since the watermark"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.provider = CustomUser.objects.create_user(email='landlord@example.com', name='Landlord', role='provider')
+        cls.viewers = [
+            CustomUser.objects.create_user(email=f'viewer{i}@example.com', name=f'Viewer {i}', role='seeker')
+            for i in range(3)
+        ]
+        cls.properties = [
+            Property.objects.create(
+                type='1BHK', category='apartment', listingType='rent', title=f'Flat {i}', description='Flat',
+                minimumPrice=Decimal(12000), location='Kothrud, Pune', city='Pune', state='Maharashtra',
+                owner=cls.provider,
+            )
+            for i in range(2)
+        ]
+
+    def view(self, viewer, prop, delay=0):
+        view = PropertyView.objects.create(user=viewer, property=prop, ip_address='203.0.113.9')
+        PropertyView.objects.filter(pk=view.pk).update(createdAt=view.createdAt + timedelta(seconds=delay))
+
+    def test_viewers_of_several_listings_count_once(self):
+        first, second, third = self.viewers
+        self.view(first, self.properties[0])
+        self.view(first, self.properties[1])
+        self.view(second, self.properties[1])
+        PropertyView.objects.create(property=self.properties[0], ip_address='203.0.113.10')
+        self.assertEqual(unique_viewers(self.provider), 2)
+
+        watermark = timezone.now() + timedelta(seconds=1)
+        roll_up(until=watermark)
+        self.assertEqual(ProviderViewer.objects.filter(provider=self.provider).count(), 2)
+        self.assertEqual(unique_viewers(self.provider), 2)
+
+        # Views after the watermark: a returning viewer and a new one
+        self.view(first, self.properties[0], delay=5)
+        self.view(third, self.properties[0], delay=5)
+        with self.assertNumQueries(3):
+            self.assertEqual(unique_viewers(self.provider), 3)
+
+        roll_up(until=watermark + timedelta(seconds=10))
+        self.assertEqual(ProviderViewer.objects.filter(provider=self.provider).count(), 3)
+        self.assertEqual(unique_viewers(self.provider), 3)
+
+class NearbyRadiusTests(TestCase):
+    """An explicit radius, zero included, is applied as given; only a missing one defaults"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.provider = CustomUser.objects.create_user(email='mapper@example.com', name='Mapper', role='provider')
+        cls.seeker = CustomUser.objects.create_user(email='walker@example.com', name='Walker', role='seeker')
+        # The second listing is about 3 km north of the first
+        cls.here, cls.near = [
+            Property.objects.create(
+                type='1BHK', category='apartment', listingType='rent', title=title, description=title,
+                minimumPrice=Decimal(14000), location='Baner, Pune', city='Pune', state='Maharashtra',
+                latitude=latitude, longitude=Decimal('73.780000'), owner=cls.provider,
+            )
+            for title, latitude in (('Here', Decimal('18.560000')), ('Near', Decimal('18.587000')))
+        ]
+
+    def nearby(self, query):
+        client = APIClient()
+        client.force_authenticate(self.seeker)
+        response = client.get(f'/api/properties/nearby/?lat=18.56&lng=73.78{query}')
+        self.assertEqual(response.status_code, 200, response.content)
+        return [result['id'] for result in response.data['results']]
+
+    def test_zero_radius_is_not_the_default(self):
+        self.assertEqual(self.nearby('&radius=0'), [self.here.id])
+        self.assertEqual(self.nearby('&radius=1'), [self.here.id])
+        self.assertEqual(self.nearby(''), [self.here.id, self.near.id])
@@ -0,0 +1,167 @@
+import atexit
+import ipaddress
+import logging
+import re
+import threading
+from collections import Counter, namedtuple
+from django.conf import settings
+from django.core.cache import cache
+from django.db import close_old_connections, transaction
+from .counters import bulk_adjust_counters
+from .models import Property, PropertyView
+
+logger = logging.getLogger(__name__)
+
+DEDUPE_KEY = 'properties:viewed:{}:{}'
+
+_bot_agents = re.compile(
+    r'bot|crawl|spider|slurp|scrape|curl|wget|python-requests|httpclient|headless|lighthouse|'
+    r'facebookexternalhit|whatsapp|preview|monitor|pingdom',
+    re.IGNORECASE,
+)
+
+ViewEvent = namedtuple('ViewEvent', ['property_id', 'user_id', 'ip_address', 'user_agent'])
+
+def is_bot(user_agent):
+    return bool(user_agent and _bot_agents.search(user_agent))
+
+def client_ip(request):
+    forwarded = request.META.get('HTTP_X_FORWARDED_FOR', '')
+    address = forwarded.split(',')[0].strip() or request.META.get('REMOTE_ADDR', '')
+    try:
+        return str(ipaddress.ip_address(address))
+    except ValueError:
+        return None
+
+def write_views(events):
+    """Insert buffered views with one bulk_create and apply their counter deltas.
+
+    bulk_create skips the PropertyView post_save signal, so the view and
+    unique viewer counters are updated here in a single UPDATE instead.
+    """
+    # Listings deleted since the view would fail the whole batch on their foreign key
+    existing = set(
+        Property.objects.filter(pk__in={event.property_id for event in events}).values_list('pk', flat=True)
+    )
+    events = [event for event in events if event.property_id in existing]
+    if not events:
+        return 0
+
+    pairs = {(event.property_id, event.user_id) for event in events if event.user_id}
+    seen = set()
+    if pairs:
+        seen = set(
+            PropertyView.objects.filter(
+                property_id__in={property_id for property_id, _ in pairs},
+                user_id__in={user_id for _, user_id in pairs},
+            ).values_list('property_id', 'user_id').distinct()
+        )
+
+    deltas = {}
+    views = Counter(event.property_id for event in events)
+    for property_id, total in views.items():
+        deltas[property_id] = {'viewCount': total, 'uniqueViewerCount': 0}
+    for property_id, user_id in pairs - seen:
+        deltas[property_id]['uniqueViewerCount'] += 1
+
+    with transaction.atomic():
+        PropertyView.objects.bulk_create(
+            [PropertyView(**event._asdict()) for event in events],
+            batch_size=settings.PROPERTY_VIEW_BUFFER['MAX_EVENTS'],
+        )
+        bulk_adjust_counters(deltas)
+    return len(events)
+
+class ViewBuffer:
+    """Per-process buffer of property views, written out by a background thread.
+
+    The thread flushes every FLUSH_INTERVAL seconds, or as soon as MAX_EVENTS
+    views are waiting. Requests only append to a list, so a slow or failing
+    flush never delays a read. Failed batches are retried while they fit in
+    MAX_PENDING; beyond that views are dropped and counted instead.
+    """
+
+    def __init__(self):
+        self.events = []
+        self.dropped = 0
+        self.lock = threading.Lock()
+        self.flush_lock = threading.Lock()
+        self.wake = threading.Event()
+        self.thread = None
+
+    def add(self, event):
+        config = settings.PROPERTY_VIEW_BUFFER
+        with self.lock:
+            if len(self.events) >= config['MAX_PENDING']:
+                self.dropped += 1
+                return
+            self.events.append(event)
+            full = len(self.events) >= config['MAX_EVENTS']
+
+        if not config['BACKGROUND']:
+            if full:
+                self.flush()
+            return
+        self._start()
+        if full:
+            self.wake.set()
+
+    def _start(self):
+        if self.thread is not None and self.thread.is_alive():
+            return
+        with self.lock:
+            if self.thread is None or not self.thread.is_alive():
+                self.thread = threading.Thread(target=self._run, name='property-view-flusher', daemon=True)
+                self.thread.start()
+
+    def _run(self):
+        while True:
+            self.wake.wait(settings.PROPERTY_VIEW_BUFFER['FLUSH_INTERVAL'])
+            self.wake.clear()
+            close_old_connections()
+            self.flush()
+
+    def flush(self):
+        """Write out everything buffered so far; returns the number of views written"""
+        with self.flush_lock:
+            with self.lock:
+                events, self.events = self.events, []
+            if not events:
+                return 0
+            try:
+                return write_views(events)
+            except Exception:
+                logger.exception(f"Could not write {len(events)} property views")
+                with self.lock:
+                    room = settings.PROPERTY_VIEW_BUFFER['MAX_PENDING'] - len(self.events)
+                    kept = events[:max(room, 0)]
+                    self.events[:0] = kept
+                    self.dropped += len(events) - len(kept)
+                return 0
+
+view_buffer = ViewBuffer()
+# Write out what is left when the worker process shuts down
+atexit.register(view_buffer.flush)
+
+def record_view(request, property_id, owner_id=None):
+    """Buffer a view of a listing unless it is a bot, the owner, or a repeat within DEDUPE_WINDOW"""
+    try:
+        user_agent = request.META.get('HTTP_USER_AGENT', '')
+        if is_bot(user_agent):
+            return False
+        user = request.user
+        user_id = user.id if user.is_authenticated else None
+        if user_id is not None and user_id == owner_id:
+            return False
+
+        ip_address = client_ip(request)
+        viewer = f'user:{user_id}' if user_id is not None else f'ip:{ip_address}'
+        if not cache.add(DEDUPE_KEY.format(property_id, viewer), 1, settings.PROPERTY_VIEW_BUFFER['DEDUPE_WINDOW']):
+            return False
+
+        view_buffer.add(ViewEvent(property_id, user_id, ip_address, user_agent[:512]))
+        return True
+    except Exception:
+        # View tracking is best effort and must never fail the read it piggybacks on
+        logger.exception(f"Could not record a view of property {property_id}")
+        return False
@@ -10,12 +10,22 @@ urlpatterns = [
     
     # Static paths before dynamic ones
     path('create/', views.PropertyCreateView.as_view(), name='property-create'),
+    path('bulk-status/', views.bulk_update_property_status, name='property-bulk-status'),
+    path('import/', views.property_import, name='property-import'),
+    path('images/', views.upload_property_images, name='property-images'),
     path('search/', views.PropertySearchView.as_view(), name='property-search'),
+    path('nearby/', views.PropertyNearbyView.as_view(), name='property-nearby'),
+    path('batch/', views.property_batch, name='property-batch'),
+    path('autocomplete/', views.location_autocomplete, name='location-autocomplete'),
     path('filters/', views.property_filters, name='property-filters'),
+    path('cache-stats/', views.property_cache_stats, name='property-cache-stats'),
     path('favorites/', views.FavoriteListView.as_view(), name='favorite-list'),
+    path('favorites/status/', views.favorite_status_batch, name='favorite-status-batch'),
+    path('favorites/count/', views.my_favorites_count, name='favorite-list-count'),
     
     # Dynamic paths with property IDs
     path('<str:pk>/', views.PropertyDetailView.as_view(), name='property-detail'),
+    path('<str:pk>/similar/', views.SimilarPropertyListView.as_view(), name='property-similar'),
     path('<str:pk>/update/', views.PropertyUpdateView.as_view(), name='property-update'),
     path('<str:pk>/delete/', views.PropertyDeleteView.as_view(), name='property-delete'),
     path('<str:property_id>/favorite/', views.FavoriteCreateView.as_view(), name='favorite-create'),
@@ -1,20 +1,89 @@
+import csv
 import traceback
-from rest_framework import generics, status, filters
+from rest_framework import generics, status
 from rest_framework.decorators import api_view, permission_classes
 from rest_framework.response import Response
-from rest_framework.permissions import IsAuthenticated
+from rest_framework.permissions import IsAdminUser, IsAuthenticated
 from django_filters.rest_framework import DjangoFilterBackend
-from django.db.models import Q
+from django.db import transaction
+from django.db.models import F
+from django.utils.decorators import method_decorator
 from .models import Property, Favorite
-from .serializers import PropertyListSerializer, PropertyDetailSerializer, PropertyCreateUpdateSerializer, PropertyStatusUpdateSerializer, FavoriteSerializer, FavoriteCreateSerializer
+from .serializers import trim_fields, PropertyListSerializer, PropertyNearbySerializer, PropertySimilarSerializer, PropertyDetailSerializer, PropertyCreateUpdateSerializer, PropertyStatusUpdateSerializer, PropertyBulkStatusSerializer, FavoriteSerializer, FavoriteCreateSerializer, FavoritePropertySerializer
+from .autocomplete import DEFAULT_LIMIT as AUTOCOMPLETE_LIMIT, MAX_LIMIT as MAX_AUTOCOMPLETE_LIMIT, location_index
+from .bulk import bulk_update_status
+from .cache import CachedListMixin, cache_details, cache_stats, get_cached, get_cached_details, request_cache_key, set_cached
+from .conditional import collection_etag, current_counters, not_modified, property_condition, record_property_view, set_validators
+from .counters import COUNTER_FIELDS
+from .facets import compute_facets, facet_options
 from .filters import PropertyFilter
-from notifications.services import fcm_service
+from .images import MAX_IMAGE_BYTES, MAX_UPLOAD_IMAGES, image_urls, store_images
+from .imports import IMPORT_FORMATS, detect_format, import_properties, open_text, read_rows
+from .pagination import PropertyCursorPagination
+from .search import PropertySearchFilter, search_properties
+from notifications.outbox import enqueue_favorite_notification
 
-class PropertyListView(generics.ListAPIView):
+FACET_CACHE_TIMEOUT = 300
+MAX_BATCH_IDS = 50
+MAX_FAVORITE_STATUS_IDS = 100
+MAX_REPORTED_IMPORT_ERRORS = 1000
+
+class ProjectedQuerysetMixin:
+    """Load only the columns the (possibly sparse) serializer renders"""
+    
+    def filter_queryset(self, queryset):
+        queryset = super().filter_queryset(queryset)
+        columns = self.get_serializer().source_columns() | {'id', 'createdAt'}
+        # Cursor pagination reads its position from the ordering columns
+        columns.update(
+            field.lstrip('-') for field in queryset.query.order_by
+            if isinstance(field, str) and field.lstrip('-') not in queryset.query.annotations
+        )
+        related = {column.split('__')[0] for column in columns if '__' in column}
+        if related:
+            queryset = queryset.select_related(*related)
+        return queryset.only(*columns)
+
+class FavoritedListMixin:
+    """Flag the seeker's favorites on each page with one IN query over its ids.
+    
+    The flags are set on top of the response cache, so cached pages stay
+    shared by every seeker. The page's ETag is extended with the favorited
+    ids, so a toggled heart never revalidates to 304.
+    """
+    
+    def list(self, request, *args, **kwargs):
+        response = super().list(request, *args, **kwargs)
+        if response.status_code != 200 or request.user.role != 'seeker':
+            return response
+        
+        results = response.data['results'] if isinstance(response.data, dict) else response.data
+        cards = [card for card in results if 'id' in card and 'is_favorited' in card]
+        if not cards:
+            return response
+        favorited = set(
+            Favorite.objects.filter(
+                user=request.user, property_id__in=[card['id'] for card in cards]
+            ).values_list('property_id', flat=True)
+        )
+        for card in cards:
+            card['is_favorited'] = card['id'] in favorited
+        
+        if response.has_header('ETag'):
+            etag = collection_etag(f"{response['ETag']}:{','.join(sorted(favorited))}")
+            unchanged = not_modified(request, etag)
+            if unchanged is not None:
+                return unchanged
+            set_validators(response, etag)
+        return response
+
+class PropertyListView(FavoritedListMixin, CachedListMixin, ProjectedQuerysetMixin, generics.ListAPIView):
     """List properties with search and filtering"""
+    cache_prefix = 'list'
     serializer_class = PropertyListSerializer
     permission_classes = [IsAuthenticated]
-    filter_backends = [DjangoFilterBackend, filters.SearchFilter]
+    pagination_class = PropertyCursorPagination
+    filter_backends = [DjangoFilterBackend, PropertySearchFilter]
     filterset_class = PropertyFilter
     search_fields = ['title', 'description', 'location', 'city']
     
@@ -26,11 +95,27 @@ class PropertyListView(generics.ListAPIView):
             queryset = queryset.filter(owner=user)        
         return queryset
 
-class PropertyDetailView(generics.RetrieveAPIView):
-    """Get detailed property information"""
+# Views are recorded first, so revalidations answered with 304 still count
+@method_decorator([record_property_view, property_condition], name='get')
+class PropertyDetailView(ProjectedQuerysetMixin, generics.RetrieveAPIView):
+    """Get detailed property information, answering revalidations with 304"""
     queryset = Property.objects.filter(isActive=True)
     serializer_class = PropertyDetailSerializer
     permission_classes = [IsAuthenticated]
+    
+    def retrieve(self, request, *args, **kwargs):
+        pk = kwargs['pk']
+        data = get_cached_details([pk]).get(pk)
+        if data is not None:
+            # Counters change without invalidating the detail cache, so they are read live
+            data = {**data, **current_counters(request, pk)}
+            return Response(trim_fields(data, request))
+        
+        data = self.get_serializer(self.get_object()).data
+        # Only the full representation is shared through the detail cache
+        if not request.query_params.get('fields') and not request.query_params.get('omit'):
+            cache_details({pk: data})
+        return Response(data)
 
 class PropertyCreateView(generics.CreateAPIView):
     """Create new property - only for providers"""
@@ -104,11 +189,40 @@ class PropertyDeleteView(generics.DestroyAPIView):
         instance.isActive = False
         instance.save()
 
-class PropertySearchView(generics.ListAPIView):
+@api_view(['PATCH'])
+@permission_classes([IsAuthenticated])
+def bulk_update_property_status(request):
+    """Update availability and/or isActive of many owned properties at once"""
+    if request.user.role != 'provider':
+        return Response(
+            {"error": "Only providers can update properties"}, 
+            status=status.HTTP_403_FORBIDDEN
+        )
+    
+    serializer = PropertyBulkStatusSerializer(data=request.data)
+    if not serializer.is_valid():
+        return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+    
+    data = serializer.validated_data
+    ids = list(dict.fromkeys(data['ids']))
+    updated = bulk_update_status(
+        request.user, ids,
+        availability=data.get('availability'),
+        isActive=data.get('isActive'),
+    )
+    changed = set(updated)
+    return Response({
+        'updated': updated,
+        'skipped': [pk for pk in ids if pk not in changed],
+    })
+
+class PropertySearchView(FavoritedListMixin, CachedListMixin, ProjectedQuerysetMixin, generics.ListAPIView):
     """Advanced search with multiple filters"""
+    cache_prefix = 'search'
     serializer_class = PropertyListSerializer
     permission_classes = [IsAuthenticated]
-    filter_backends = [DjangoFilterBackend, filters.SearchFilter]
+    pagination_class = PropertyCursorPagination
+    filter_backends = [DjangoFilterBackend, PropertySearchFilter]
     filterset_class = PropertyFilter
     search_fields = ['title', 'description', 'location', 'city']
     
@@ -123,19 +237,53 @@ class PropertySearchView(generics.ListAPIView):
         # Additional manual filters
         search_query = self.request.GET.get('q')
         if search_query:
-            queryset = queryset.filter(
-                Q(title__icontains=search_query) |
-                Q(description__icontains=search_query) |
-                Q(location__icontains=search_query)
-            )
+            queryset = search_properties(queryset, search_query)
         
         return queryset
 
+class PropertyNearbyView(FavoritedListMixin, ProjectedQuerysetMixin, generics.ListAPIView):
+    """Properties within a radius of a point, nearest first"""
+    serializer_class = PropertyNearbySerializer
+    permission_classes = [IsAuthenticated]
+    pagination_class = PropertyCursorPagination
+    filter_backends = [DjangoFilterBackend]
+    filterset_class = PropertyFilter
+    
+    def get_queryset(self):
+        user = self.request.user
+        queryset = Property.objects.filter(isActive=True)
+        
+        if user.role == 'provider':
+            queryset = queryset.filter(owner=user)
+        return queryset
+    
+    def list(self, request, *args, **kwargs):
+        if not request.GET.get('lat') or not request.GET.get('lng'):
+            return Response(
+                {"error": "lat and lng are required"}, 
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        return super().list(request, *args, **kwargs)
+
+class SimilarPropertyListView(FavoritedListMixin, ProjectedQuerysetMixin, generics.ListAPIView):
+    """Precomputed most similar active listings, best match first"""
+    serializer_class = PropertySimilarSerializer
+    permission_classes = [IsAuthenticated]
+    
+    def get_queryset(self):
+        return Property.objects.filter(
+            isActive=True,
+            similar_to__property_id=self.kwargs['pk'],
+        ).annotate(
+            similarity=F('similar_to__score'),
+            similar_rank=F('similar_to__rank'),
+        ).order_by('similar_rank')
+
 @api_view(['GET'])
 @permission_classes([IsAuthenticated])
 def property_filters(request):
-    """Get available filter options"""
-    return Response({
+    """Get available filter options, with live result counts when ?facets=true"""
+    options = {
         'types': [{'value': choice[0], 'label': choice[1]} for choice in Property.PROPERTY_TYPES],
         'categories': [{'value': choice[0], 'label': choice[1]} for choice in Property.CATEGORIES],
         'roomConfigs': [{'value': choice[0], 'label': choice[1]} for choice in Property.ROOM_CONFIGS],
@@ -143,18 +291,201 @@ def property_filters(request):
         'availability': [{'value': choice[0], 'label': choice[1]} for choice in Property.AVAILABILITY_STATUS],
         'furnishingStatus': [{'value': choice[0], 'label': choice[1]} for choice in Property.FURNISHING_STATUS],
         'genderPreferences': [{'value': choice[0], 'label': choice[1]} for choice in Property.GENDER_PREFERENCES],
+    }
+    if request.GET.get('facets') != 'true':
+        return Response(options)
+    
+    cache_key = request_cache_key('facets', request)
+    facets = get_cached(cache_key)
+    if facets is None:
+        queryset = Property.objects.filter(isActive=True)
+        if request.user.role == 'provider':
+            queryset = queryset.filter(owner=request.user)
+        
+        search_query = request.GET.get('q')
+        if search_query:
+            queryset = search_properties(queryset, search_query)
+        
+        filterset = PropertyFilter(request.GET, queryset=queryset, request=request)
+        if not filterset.is_valid():
+            return Response(filterset.errors, status=status.HTTP_400_BAD_REQUEST)
+        
+        facets = facet_options(compute_facets(filterset.qs))
+        set_cached(cache_key, facets, FACET_CACHE_TIMEOUT)
+    
+    options.update({
+        'types': facets['type'],
+        'categories': facets['category'],
+        'listingTypes': facets['listingType'],
+        'availability': facets['availability'],
+        'furnishingStatus': facets['furnishingStatus'],
+        'genderPreferences': facets['genderPreference'],
+        'cities': facets['city'],
+        'amenities': facets['amenities'],
+    })
+    return Response(options)
+
+@api_view(['POST'])
+@permission_classes([IsAuthenticated])
+def property_import(request):
+    """Bulk import listings from an uploaded CSV or JSONL file - only for providers"""
+    if request.user.role != 'provider':
+        return Response(
+            {"error": "Only providers can import properties"}, 
+            status=status.HTTP_403_FORBIDDEN
+        )
+    
+    upload = request.FILES.get('file')
+    if upload is None:
+        return Response({"error": "file is required"}, status=status.HTTP_400_BAD_REQUEST)
+    
+    file_format = request.data.get('format') or detect_format(upload.name)
+    if file_format not in IMPORT_FORMATS:
+        return Response(
+            {"error": f"format must be one of {', '.join(IMPORT_FORMATS)}"}, 
+            status=status.HTTP_400_BAD_REQUEST
+        )
+    
+    dry_run = request.data.get('dry_run') in ('true', True)
+    errors = []
+    def collect_error(line, detail):
+        if len(errors) < MAX_REPORTED_IMPORT_ERRORS:
+            errors.append({'line': line, 'errors': detail})
+    
+    try:
+        result = import_properties(
+            read_rows(open_text(upload.file), file_format),
+            owner=request.user,
+            dry_run=dry_run,
+            on_error=collect_error,
+        )
+    except (UnicodeDecodeError, csv.Error) as e:
+        return Response({"error": f"Could not read file: {str(e)}"}, status=status.HTTP_400_BAD_REQUEST)
+    
+    result['errors'] = errors
+    created = result['created'] and not dry_run
+    return Response(result, status=status.HTTP_201_CREATED if created else status.HTTP_200_OK)
+
+@api_view(['POST'])
+@permission_classes([IsAuthenticated])
+def upload_property_images(request):
+    """Upload listing photos and get the image ids to save in imageIds - only for providers"""
+    if request.user.role != 'provider':
+        return Response(
+            {"error": "Only providers can upload property images"}, 
+            status=status.HTTP_403_FORBIDDEN
+        )
+    
+    uploads = request.FILES.getlist('images')
+    if not uploads:
+        return Response({"error": "images is required"}, status=status.HTTP_400_BAD_REQUEST)
+    if len(uploads) > MAX_UPLOAD_IMAGES:
+        return Response(
+            {"error": f"At most {MAX_UPLOAD_IMAGES} images can be uploaded at once"}, 
+            status=status.HTTP_400_BAD_REQUEST
+        )
+    for upload in uploads:
+        if upload.size > MAX_IMAGE_BYTES:
+            return Response(
+                {"error": f"{upload.name} is larger than {MAX_IMAGE_BYTES // (1024 * 1024)}MB"}, 
+                status=status.HTTP_400_BAD_REQUEST
+            )
+    
+    try:
+        image_ids = store_images(uploads)
+    except ValueError as e:
+        return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
+    
+    return Response(
+        {'imageIds': image_ids, 'images': image_urls(image_ids)}, 
+        status=status.HTTP_201_CREATED
+    )
+
+def _batch_ids(request, limit=MAX_BATCH_IDS):
+    """Distinct ids from ?ids= or a POSTed list, or an error response"""
+    if request.method == 'POST':
+        ids = request.data.get('ids', [])
+    else:
+        ids = request.GET.get('ids', '').split(',')
+    if not isinstance(ids, list):
+        return None, Response({"error": "ids must be a list"}, status=status.HTTP_400_BAD_REQUEST)
+    
+    ids = list(dict.fromkeys(str(pk).strip() for pk in ids if str(pk).strip()))
+    if not ids:
+        return None, Response({"error": "ids is required"}, status=status.HTTP_400_BAD_REQUEST)
+    if len(ids) > limit:
+        return None, Response(
+            {"error": f"At most {limit} ids can be fetched at once"},
+            status=status.HTTP_400_BAD_REQUEST
+        )
+    return ids, None
+
+@api_view(['GET', 'POST'])
+@permission_classes([IsAuthenticated])
+def property_batch(request):
+    """Fetch several properties in one round trip, in request order"""
+    ids, error = _batch_ids(request)
+    if error:
+        return error
+    
+    details = get_cached_details(ids)
+    if details:
+        # Counters change without invalidating the detail cache, so they are read live
+        for row in Property.objects.filter(id__in=list(details)).values('id', *COUNTER_FIELDS):
+            details[row.pop('id')].update(row)
+    inactive = []
+    pending = [pk for pk in ids if pk not in details]
+    if pending:
+        fetched = {}
+        for prop in Property.objects.filter(id__in=pending).select_related('owner'):
+            if prop.isActive:
+                fetched[prop.id] = PropertyDetailSerializer(prop).data
+            else:
+                inactive.append(prop.id)
+        cache_details(fetched)
+        details.update(fetched)
+    
+    return Response({
+        'results': [trim_fields(details[pk], request) for pk in ids if pk in details],
+        'missing': [pk for pk in ids if pk not in details and pk not in inactive],
+        'inactive': [pk for pk in ids if pk in inactive],
     })
 
+@api_view(['GET'])
+@permission_classes([IsAuthenticated])
+def location_autocomplete(request):
+    """Suggest cities, states and localities for a typed prefix, most listings first"""
+    prefix = request.GET.get('q', '').strip()
+    if not prefix:
+        return Response([])
+    try:
+        limit = min(int(request.GET.get('limit', AUTOCOMPLETE_LIMIT)), MAX_AUTOCOMPLETE_LIMIT)
+    except ValueError:
+        return Response({"error": "limit must be a number"}, status=status.HTTP_400_BAD_REQUEST)
+    
+    location_index.sync()
+    return Response(location_index.search(prefix, max(limit, 1)))
+
+@api_view(['GET'])
+@permission_classes([IsAdminUser])
+def property_cache_stats(request):
+    """Hit rate and memory use of the property response cache"""
+    return Response(cache_stats())
+
 # Favorite Views
 class FavoriteListView(generics.ListAPIView):
     """List user's favorite properties"""
     serializer_class = FavoriteSerializer
     permission_classes = [IsAuthenticated]
+    pagination_class = PropertyCursorPagination
     
     def get_queryset(self):
         if self.request.user.role != 'seeker':
             return Favorite.objects.none()
-        return Favorite.objects.filter(user=self.request.user, property__isActive=True)
+        # One joined query per page, loading only the card columns
+        return Favorite.objects.filter(
+            user=self.request.user, property__isActive=True
+        ).select_related('user', 'property').only(*self.get_serializer().source_columns())
 
 class FavoriteCreateView(generics.CreateAPIView):
     """Add property to favorites"""
@@ -169,8 +500,10 @@ class FavoriteCreateView(generics.CreateAPIView):
             )
         
         property_id = kwargs.get('property_id')
+        # The response nests the property card, so load its columns up front
+        columns = FavoritePropertySerializer().source_columns() | {'id', 'title', 'owner'}
         try:
-            property_obj = Property.objects.get(id=property_id, isActive=True)
+            property_obj = Property.objects.only(*columns).get(id=property_id, isActive=True)
         except Property.DoesNotExist:
             return Response(
                 {"error": "Property not found"}, 
@@ -184,14 +517,10 @@ class FavoriteCreateView(generics.CreateAPIView):
                 status=status.HTTP_400_BAD_REQUEST
             )
         
-        favorite = Favorite.objects.create(user=request.user, property=property_obj)
-        
-        # Send notification to property owner
-        fcm_service.send_favorite_notification(
-            property_owner=property_obj.owner,
-            user=request.user,
-            property_title=property_obj.title
-        )
+        # The owner's notification is queued with the favorite and sent by the outbox worker
+        with transaction.atomic():
+            favorite = Favorite.objects.create(user=request.user, property=property_obj)
+            enqueue_favorite_notification(favorite, property_obj)
         
         serializer = FavoriteSerializer(favorite)
         return Response(serializer.data, status=status.HTTP_201_CREATED)
@@ -241,17 +570,21 @@ def toggle_favorite(request, property_id):
         )
     
     try:
-        property_obj = Property.objects.get(id=property_id, isActive=True)
+        property_obj = Property.objects.only('id', 'title', 'owner').get(id=property_id, isActive=True)
     except Property.DoesNotExist:
         return Response(
             {"error": "Property not found"}, 
             status=status.HTTP_404_NOT_FOUND
         )
     
-    favorite, created = Favorite.objects.get_or_create(
-        user=request.user, 
-        property=property_obj
-    )
+    with transaction.atomic():
+        favorite, created = Favorite.objects.get_or_create(
+            user=request.user, 
+            property=property_obj
+        )
+        if created:
+            # Newly favorited - the outbox worker notifies the owner after commit
+            enqueue_favorite_notification(favorite, property_obj)
     
     if not created:
         # Already favorited, so remove it
@@ -261,13 +594,6 @@ def toggle_favorite(request, property_id):
             "message": "Property removed from favorites"
         })
     else:
-        # Newly favorited - send notification
-        fcm_service.send_favorite_notification(
-            property_owner=property_obj.owner,
-            user=request.user,
-            property_title=property_obj.title
-        )
-        
         return Response({
             "favorited": True,
             "message": "Property added to favorites",
@@ -288,13 +614,37 @@ def check_favorite_status(request, property_id):
     
     return Response({"favorited": is_favorited})
 
+@api_view(['GET'])
+@permission_classes([IsAuthenticated])
+def my_favorites_count(request):
+    """Get the number of active properties the current user has favorited"""
+    if request.user.role != 'seeker':
+        return Response({"count": 0})
+    
+    count = Favorite.objects.filter(user=request.user, property__isActive=True).count()
+    return Response({"count": count})
+
+@api_view(['GET', 'POST'])
+@permission_classes([IsAuthenticated])
+def favorite_status_batch(request):
+    """Check which of several properties the current user has favorited, in one query"""
+    ids, error = _batch_ids(request, limit=MAX_FAVORITE_STATUS_IDS)
+    if error:
+        return error
+    
+    favorited = set()
+    if request.user.role == 'seeker':
+        favorited = set(
+            Favorite.objects.filter(user=request.user, property_id__in=ids).values_list('property_id', flat=True)
+        )
+    return Response({"favorited": {pk: pk in favorited for pk in ids}})
+
 @api_view(['GET'])
 @permission_classes([IsAuthenticated])
 def favorite_count(request, property_id):
     """Get total favorite count for a property"""
     try:
-        property_obj = Property.objects.get(id=property_id, isActive=True)
-        count = property_obj.favorited_by.count()
+        count = Property.objects.values_list('favoriteCount', flat=True).get(id=property_id, isActive=True)
         return Response({"count": count})
     except Property.DoesNotExist:
         return Response(
@@ -0,0 +1,59 @@
+import secrets
+import statistics
+import string
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+from psycopg2.extras import execute_values
+
+from utils.ids import generate_unique_id
+
+def legacy_random_id():
+    """The previous generator: 16 independent secrets.choice calls"""
+    return ''.join(secrets.choice(string.ascii_uppercase + string.digits) for _ in range(16))
+
+GENERATORS = {
+    'random': legacy_random_id,
+    'time-sorted': generate_unique_id,
+}
+
+class Command(BaseCommand):
+    help = 'Compare id generation speed, insert throughput and primary key index size of the id generators'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--rows', type=int, default=500_000, help='Rows inserted per generator')
+        parser.add_argument('--batch-size', type=int, default=5_000, help='Rows per INSERT statement')
+
+    def handle(self, *args, **options):
+        rows, batch_size = options['rows'], options['batch_size']
+
+        for name, generate in GENERATORS.items():
+            start = time.perf_counter()
+            for _ in range(100_000):
+                generate()
+            per_id = (time.perf_counter() - start) / 100_000 * 1e6
+            self.stdout.write(f'{name:<12} generate: {per_id:6.2f}us per id')
+
+        for name, generate in GENERATORS.items():
+            with transaction.atomic():
+                with connection.cursor() as cursor:
+                    # Same shape as the app tables: varchar(16) primary key plus a payload
+                    cursor.execute(
+                        'CREATE TEMP TABLE id_benchmark (id varchar(16) PRIMARY KEY, payload text) ON COMMIT DROP'
+                    )
+                    timings = []
+                    for offset in range(0, rows, batch_size):
+                        batch = [(generate(), 'x' * 100) for _ in range(min(batch_size, rows - offset))]
+                        start = time.perf_counter()
+                        execute_values(cursor.cursor, 'INSERT INTO id_benchmark (id, payload) VALUES %s', batch, page_size=batch_size)
+                        timings.append(time.perf_counter() - start)
+                    cursor.execute("SELECT pg_relation_size('id_benchmark_pkey')")
+                    index_size = cursor.fetchone()[0]
+
+            total = sum(timings)
+            self.stdout.write(
+                f'{name:<12} insert: {rows / total:10.0f} rows/s '
+                f'(median batch {statistics.median(timings) * 1000:7.1f}ms), '
+                f'pk index {index_size / 1024 / 1024:6.1f} MB'
+            )
@@ -0,0 +1,28 @@
+from unittest import mock
+
+from django.test import SimpleTestCase
+
+from . import ids
+
+class GenerateUniqueIdTests(SimpleTestCase):
+    """Ids are fixed-length Crockford base32 and strictly increase within a process"""
+
+    def test_ids_increase_within_one_millisecond(self):
+        with mock.patch.object(ids.time, 'time_ns', return_value=1_700_000_000_000_000_000):
+            generated = [ids.generate_unique_id() for _ in range(1000)]
+        self.assertEqual(generated, sorted(set(generated)))
+        self.assertTrue(all(len(value) == ids.ID_LENGTH and set(value) <= set(ids.ALPHABET) for value in generated))
+
+    def test_ids_keep_increasing_when_the_clock_goes_back(self):
+        with mock.patch.object(ids.time, 'time_ns', return_value=1_700_000_000_000_000_000):
+            before = ids.generate_unique_id()
+        with mock.patch.object(ids.time, 'time_ns', return_value=1_600_000_000_000_000_000):
+            after = ids.generate_unique_id()
+        self.assertGreater(after, before)
+
+    def test_later_milliseconds_sort_later(self):
+        with mock.patch.object(ids.time, 'time_ns', return_value=1_800_000_000_000_000_000):
+            earlier = ids.generate_unique_id()
+        with mock.patch.object(ids.time, 'time_ns', return_value=1_800_000_000_001_000_000):
+            later = ids.generate_unique_id()
+        self.assertGreater(later, earlier)
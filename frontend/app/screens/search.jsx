@@ -43,7 +43,7 @@ const Search = () => {
   const [refreshing, setRefreshing] = useState(false);
   const [showFilterDrawer, setShowFilterDrawer] = useState(false);
   const [hasMoreProperties, setHasMoreProperties] = useState(true);
-  const [currentPage, setCurrentPage] = useState(0);
+  const [nextCursor, setNextCursor] = useState(null);
   const [selectedLocation, setSelectedLocation] = useState(null);
   const [showLocationSearch, setShowLocationSearch] = useState(false);
   const [showMapView, setShowMapView] = useState(false);
@@ -120,7 +120,7 @@ const Search = () => {
         if (!loadMore) {
           setLoading(true);
           setSearchedProperties([]);
-          setCurrentPage(0);
+          setNextCursor(null);
           setHasMoreProperties(true);
           setHasSearched(true);
         }
@@ -153,11 +153,13 @@ const Search = () => {
         }
 
         const searchCriteria = {
-          page: loadMore ? currentPage + 1 : 0,
-          size: 10,
+          page_size: 10,
           sortBy: "createdAt",
           sortDirection: "desc",
         };
+        if (loadMore && nextCursor) {
+          searchCriteria.cursor = nextCursor;
+        }
 
         // Add search query
         if (searchQuery.trim()) {
@@ -201,14 +203,13 @@ const Search = () => {
           
           if (loadMore) {
             setSearchedProperties((prev) => [...prev, ...newProperties]);
-            setCurrentPage(prev => prev + 1);
           } else {
             setSearchedProperties(newProperties);
-            setCurrentPage(0);
           }
 
-          // Update pagination
-          setHasMoreProperties(newProperties.length === 10 && response.hasMore !== false);
+          // Follow the cursor of the next link; there is no next link on the last page
+          setNextCursor(response.nextCursor || null);
+          setHasMoreProperties(Boolean(response.nextCursor));
         } else {
           setSearchedProperties([]);
           setHasMoreProperties(false);
@@ -224,7 +225,7 @@ const Search = () => {
         setLoading(false);
       }
     },
-    [searchQuery, filters, currentPage, fetchProperties, clearError]
+    [searchQuery, filters, nextCursor, fetchProperties, clearError]
   );
 
   const updateActiveFilters = () => {
@@ -30,7 +30,7 @@ const SavedProperties = () => {
   const fetchFavoriteProperties = async () => {
     try {
       setLoading(true);
-      const response = await favoritesAPI.getFavoriteProperties();
+      const response = await favoritesAPI.getAllFavoriteProperties();
       
       if (response.success) {
         // Extract properties from favorites data
@@ -238,8 +238,8 @@ export function DatabaseProvider({ children }) {
         filters.search || Object.keys(filters).length > 2
           ? await propertyAPI.searchProperties(filters)
           : await propertyAPI.getProperties(
-              filters.page || 1,
-              filters.size || 10,
+              filters.cursor || null,
+              filters.page_size || 10,
               filters.sortBy || "createdAt",
               filters.sortDirection || "desc"
             );
@@ -247,7 +247,7 @@ export function DatabaseProvider({ children }) {
       if (response.success && response.data) {
         const { properties: fetchedProperties, ...paginationData } =
           response.data;
-        if (!filters.page || filters.page === 1) {
+        if (!filters.cursor) {
           setProperties(fetchedProperties);
         } else {
           setProperties((prev) => [...prev, ...fetchedProperties]);
@@ -498,7 +498,7 @@ export function DatabaseProvider({ children }) {
       }
 
       setFavoritesLoading(true);
-      const response = await favoritesAPI.getFavoriteProperties(0, 100);
+      const response = await favoritesAPI.getAllFavoriteProperties();
 
       if (response.success && response.data) {
         const favoritesWithProperties =
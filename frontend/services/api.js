@@ -220,6 +220,13 @@ apiClient.interceptors.response.use(
   }
 );
 
+// List endpoints use cursor pagination: the next page is fetched with the
+// cursor taken from the `next` link, and `next` is null on the last page
+const getNextCursor = (next) => {
+  const match = next && next.match(/[?&]cursor=([^&]*)/);
+  return match ? decodeURIComponent(match[1]) : null;
+};
+
 export const authAPI = {
   async register(userData) {
     try {
@@ -429,11 +436,13 @@ export const propertyAPI = {
     }
   },
 
-  async getProperties(page = 1, size = 10, sortBy = "createdAt", sortDirection = "desc") {
+  async getProperties(cursor = null, size = 10, sortBy = "createdAt", sortDirection = "desc") {
     try {
-      const response = await apiClient.get("/api/properties/", {
-        params: { page, page_size: size, ordering: sortDirection === 'desc' ? `-${sortBy}` : sortBy },
-      });
+      const params = { page_size: size, ordering: sortDirection === 'desc' ? `-${sortBy}` : sortBy };
+      if (cursor) {
+        params.cursor = cursor;
+      }
+      const response = await apiClient.get("/api/properties/", { params });
       
       const properties = response.data.results || response.data;
       return {
@@ -452,9 +461,10 @@ export const propertyAPI = {
               : {},
             imagesLoading: true,
           })),
-          totalElements: response.data.count || properties.length,
-          totalPages: response.data.count ? Math.ceil(response.data.count / size) : 1,
-          currentPage: page,
+          totalElements: properties.length,
+          next: response.data.next || null,
+          nextCursor: getNextCursor(response.data.next),
+          hasMore: Boolean(response.data.next),
         }
       };
     } catch (error) {
@@ -527,10 +537,13 @@ export const propertyAPI = {
       
       const response = await apiClient.get(`/api/properties/search/?${params.toString()}`);
       
-      const properties = Array.isArray(response.data) ? response.data : [];
+      const properties = Array.isArray(response.data) ? response.data : (response.data.results || []);
       return {
         success: true,
         data: {
+          next: response.data.next || null,
+          nextCursor: getNextCursor(response.data.next),
+          hasMore: Boolean(response.data.next),
           properties: properties.map(property => ({
             ...property,
             imageLoadingStates: property.imageIds
@@ -889,12 +902,11 @@ export const favoritesAPI = {
     }
   },
 
-  async getFavoriteProperties(page = 1, size = 10) {
+  async getFavoriteProperties(cursor = null, size = 10) {
     try {
-      const params = {};
-      if (page >= 1 && size > 0) {
-        params.page = page;
-        params.page_size = size;
+      const params = { page_size: size };
+      if (cursor) {
+        params.cursor = cursor;
       }
 
       const response = await apiClient.get("/api/properties/favorites/", { params });
@@ -904,7 +916,10 @@ export const favoritesAPI = {
         data: {
           favorites: favorites,
           properties: favorites, // For backward compatibility
-          totalElements: response.data.count || favorites.length,
+          totalElements: favorites.length,
+          next: response.data.next || null,
+          nextCursor: getNextCursor(response.data.next),
+          hasMore: Boolean(response.data.next),
         }
       };
     } catch (error) {
@@ -912,13 +927,30 @@ export const favoritesAPI = {
     }
   },
 
+  async getAllFavoriteProperties(size = 100) {
+    const favorites = [];
+    let cursor = null;
+    do {
+      const response = await this.getFavoriteProperties(cursor, size);
+      favorites.push(...response.data.favorites);
+      cursor = response.data.nextCursor;
+    } while (cursor);
+    return {
+      success: true,
+      data: {
+        favorites: favorites,
+        properties: favorites, // For backward compatibility
+        totalElements: favorites.length,
+      }
+    };
+  },
+
   async getFavoritesCount() {
     try {
-      const response = await apiClient.get("/api/properties/favorites/");
-      const count = response.data.count || (response.data.results ? response.data.results.length : 0);
+      const response = await apiClient.get("/api/properties/favorites/count/");
       return {
         success: true,
-        data: count
+        data: response.data.count
       };
     } catch (error) {
       throw error;